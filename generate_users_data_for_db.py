@@ -279,7 +279,7 @@ def generate_comments_for_db() -> list:
             "fields": {
                 "text": generate_text_for_comment(),
                 "owner": user_id,
-                "created_date": "2022-01-01",
+                "created_at": "2022-01-01T00:00:00Z",
             },
         }
         comment_id += 1
@@ -367,7 +367,7 @@ def generate_posts_for_db() -> list:
                         "hashtags": hashtags,
                         "likes": generate_likes(),
                         "comments": comment_ids,
-                        "created_date": "2022-01-01",
+                        "created_at": "2022-01-01T00:00:00Z",
                     },
                 }
 
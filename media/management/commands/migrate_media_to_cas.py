@@ -0,0 +1,81 @@
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
+
+from media.models import MediaBlob
+from media.storage import ContentAddressedStorage
+from media.variants import variant_file_names
+
+# Image fields whose files are moved, with their variants, into blobs.
+IMAGE_FIELDS = (
+    ("post.Post", "image"),
+    ("users.User", "photo"),
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command that moves uploads saved under their legacy paths into
+    content-addressed blobs and reports the space saved by deduplication
+    """
+
+    def handle(self, *args, **options):
+        self.legacy_bytes = 0
+        self.blob_bytes = 0
+        moved = 0
+        for model_label, field_name in IMAGE_FIELDS:
+            model = apps.get_model(model_label)
+            storage = model._meta.get_field(field_name).storage
+            if not isinstance(storage, ContentAddressedStorage):
+                raise CommandError(
+                    f"{model_label}.{field_name} doesn't use "
+                    f"ContentAddressedStorage"
+                )
+            instances = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{f"{field_name}__startswith": "blobs/"})
+            )
+            for instance in instances.iterator(chunk_size=500):
+                moved += self.migrate(instance, field_name, storage)
+
+        saved = self.legacy_bytes - self.blob_bytes
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {moved} files: {self.legacy_bytes} bytes stored "
+                f"as {self.blob_bytes} bytes of new blobs, "
+                f"{saved} bytes saved"
+            )
+        )
+
+    def migrate(self, instance, field_name: str, storage) -> int:
+        field_file = getattr(instance, field_name)
+        variants_field = f"{field_name}_variants"
+        variants = getattr(instance, variants_field) or {}
+        names = {}
+
+        for name in [field_file.name, *variant_file_names(variants)]:
+            if storage.is_blob(name):
+                continue
+            if not storage.exists(name):
+                self.stderr.write(f"Missing file {name}, skipped")
+                continue
+            with storage.open(name) as content:
+                names[name] = storage.save(name, content)
+            self.legacy_bytes += storage.size(names[name])
+            blob = MediaBlob.objects.get(name=names[name])
+            if blob.refcount == 1:
+                self.blob_bytes += blob.size
+
+        if field_file.name not in names:
+            return 0
+        field_file.name = names[field_file.name]
+        if variants.get("source") in names:
+            variants["source"] = names[variants["source"]]
+        for formats in variants.get("sizes", {}).values():
+            for extension, name in formats.items():
+                formats[extension] = names.get(name, name)
+        instance.save(update_fields=[field_name, variants_field])
+
+        for name in names:
+            storage.delete(name)
+        return len(names)
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        db_comment="Storage name of the blob, derived from its SHA-256",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "size",
+                    models.PositiveBigIntegerField(
+                        db_comment="Size of the blob in bytes"
+                    ),
+                ),
+                (
+                    "refcount",
+                    models.PositiveIntegerField(
+                        db_comment="Number of stored references to the blob", default=0
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class RemoteImageStatus(models.TextChoices):
+    """State of an image that is being fetched from a remote URL."""
+
+    PENDING = "pending", "Pending"
+    READY = "ready", "Ready"
+    FAILED = "failed", "Failed"
+
+
+class MediaBlob(models.Model):
+    """
+    A file stored under the hash of its content, shared by every upload of
+    the same content. The file is deleted when its last reference is.
+    """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        db_comment="Storage name of the blob, derived from its SHA-256",
+    )
+    size = models.PositiveBigIntegerField(
+        db_comment="Size of the blob in bytes"
+    )
+    refcount = models.PositiveIntegerField(
+        default=0,
+        db_comment="Number of stored references to the blob",
+    )
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
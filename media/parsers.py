@@ -0,0 +1,32 @@
+from rest_framework import parsers, status
+from rest_framework.exceptions import (
+    APIException,
+    ParseError,
+    ValidationError,
+)
+
+from media.upload_handlers import InvalidImageUpload, UploadTooLarge
+
+
+class RequestEntityTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request entity too large."
+    default_code = "request_entity_too_large"
+
+
+class MultiPartParser(parsers.MultiPartParser):
+    """
+    Multipart parser that reports uploads rejected by
+    `ImageUploadLimitHandler` as 413 or as a validation error of the field.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return super().parse(stream, media_type, parser_context)
+        except ParseError as error:
+            cause = error.__context__
+            if isinstance(cause, UploadTooLarge):
+                raise RequestEntityTooLarge(str(cause))
+            if isinstance(cause, InvalidImageUpload):
+                raise ValidationError({cause.field_name: [str(cause)]})
+            raise
@@ -0,0 +1,101 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from rest_framework import serializers
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+
+from media.models import RemoteImageStatus
+from media.tasks import fetch_remote_image
+
+
+class RemoteImageSerializerMixin:
+    """
+    Accept an http(s) URL in place of an uploaded image.
+
+    The URL is saved on the instance with a pending status and the image is
+    fetched by a Celery task once the transaction commits, so the request
+    never waits for the remote server.
+    """
+
+    remote_image_field = "image"
+
+    def to_internal_value(self, data) -> dict:
+        field_name = self.remote_image_field
+        url = data.get(field_name)
+        if isinstance(url, str) and url.startswith("http"):
+            try:
+                URLValidator(schemes=["http", "https"])(url)
+            except DjangoValidationError:
+                raise serializers.ValidationError(
+                    {field_name: "Enter a valid URL."}
+                )
+            data = data.copy()
+            del data[field_name]
+        else:
+            url = None
+
+        validated_data = super().to_internal_value(data)
+        if url is not None:
+            validated_data[f"{field_name}_source_url"] = url
+            validated_data[f"{field_name}_status"] = RemoteImageStatus.PENDING
+        elif validated_data.get(field_name) is not None:
+            validated_data[f"{field_name}_source_url"] = None
+            validated_data[f"{field_name}_status"] = ""
+        return validated_data
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        field_name = self.remote_image_field
+        if (
+            instance.pk is not None
+            and f"{field_name}_source_url" in self.validated_data
+            and getattr(instance, f"{field_name}_status")
+            == RemoteImageStatus.PENDING
+        ):
+            transaction.on_commit(
+                lambda: fetch_remote_image.delay(
+                    instance._meta.label, instance.pk, field_name
+                )
+            )
+        return instance
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    """
+    Render the stored variants of an image field as absolute URLs, with the
+    image dimensions and placeholder. Renders None until the variants of
+    the current image are ready.
+    """
+
+    def __init__(self, image_field: str, **kwargs) -> None:
+        self.image_field = image_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance) -> dict | None:
+        field_file = getattr(instance, self.image_field)
+        variants = getattr(instance, f"{self.image_field}_variants") or {}
+        if not field_file or variants.get("source") != field_file.name:
+            return None
+
+        request = self.context.get("request")
+        storage = field_file.storage
+        representation = {
+            "width": getattr(instance, f"{self.image_field}_width"),
+            "height": getattr(instance, f"{self.image_field}_height"),
+            "placeholder": getattr(
+                instance, f"{self.image_field}_placeholder"
+            ),
+        }
+        for variant, formats in variants["sizes"].items():
+            representation[variant] = {}
+            for extension, name in formats.items():
+                url = storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                representation[variant][extension] = url
+        return representation
@@ -0,0 +1,97 @@
+from django.db import router, transaction
+
+from media.tasks import generate_image_variants
+from media.variants import image_file_names, needs_variants
+
+
+def dispatch_image_variants(instance, field_name: str) -> None:
+    """
+    Queue the creation of the variants of an image field once the saved
+    image is committed, unless its variants are already up to date.
+    """
+    if not needs_variants(instance, field_name):
+        return
+    model_label = instance._meta.label
+    transaction.on_commit(
+        lambda: generate_image_variants.delay(
+            model_label, instance.pk, field_name
+        )
+    )
+
+
+def release_image_files(instance, field_name: str) -> None:
+    """
+    Release the stored files of an image field of a deleted instance, the
+    image and its variants, once the deletion is committed.
+    """
+    storage = getattr(instance, field_name).storage
+    names = image_file_names(instance, field_name)
+
+    def release() -> None:
+        for name in names:
+            storage.delete(name)
+
+    transaction.on_commit(release)
+
+
+def _stored_names(instance) -> dict:
+    return instance.__dict__.setdefault("_stored_image_names", {})
+
+
+def remember_image_name(instance, field_name: str) -> None:
+    """
+    Remember the stored name of an image field of a loaded instance, so a
+    save can tell cheaply whether the image was replaced.
+    """
+    if field_name in instance.__dict__:
+        value = instance.__dict__[field_name]
+        _stored_names(instance)[field_name] = (
+            getattr(value, "name", value) or ""
+        )
+
+
+def find_replaced_image(
+    instance, field_name: str, update_fields=None
+) -> None:
+    """
+    Before an instance is saved, look up the stored image its field is
+    about to replace or remove. The row is locked when the save runs in a
+    transaction, so concurrent replacements each release the image they
+    actually replaced.
+    """
+    instance.__dict__.setdefault("_replaced_images", {}).pop(field_name, None)
+    if instance.pk is None or field_name not in instance.__dict__:
+        return
+    if update_fields is not None and field_name not in update_fields:
+        return
+    field_file = getattr(instance, field_name)
+    new_upload = bool(field_file) and not field_file._committed
+    stored_name = _stored_names(instance).get(field_name)
+    if not new_upload and stored_name == (field_file.name or ""):
+        return
+    queryset = type(instance)._base_manager.filter(pk=instance.pk)
+    using = router.db_for_write(type(instance), instance=instance)
+    if transaction.get_connection(using).in_atomic_block:
+        queryset = queryset.select_for_update()
+    old_name = queryset.values_list(field_name, flat=True).first() or ""
+    instance._replaced_images[field_name] = (old_name, new_upload)
+
+
+def release_replaced_image(instance, field_name: str) -> None:
+    """
+    Release the stored image replaced or removed by a save once the save
+    is committed. A new upload took its own reference to its file, even
+    when it has the same content as the replaced one.
+    """
+    field_file = getattr(instance, field_name)
+    current_name = field_file.name or ""
+    _stored_names(instance)[field_name] = current_name
+    replaced = instance.__dict__.get("_replaced_images", {}).pop(
+        field_name, None
+    )
+    if replaced is None:
+        return
+    old_name, new_upload = replaced
+    if old_name and (old_name != current_name or new_upload):
+        storage = field_file.storage
+        transaction.on_commit(lambda: storage.delete(old_name))
@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+from media.models import MediaBlob
+
+BLOB_PREFIX = "blobs/"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage naming files by the SHA-256 of their content.
+
+    The name given on save only provides the extension. Identical uploads
+    share one blob, counted in `MediaBlob`, and a blob is removed once
+    every reference to it is deleted. As a blob never changes, its URL can
+    be cached forever.
+
+    Files saved before this storage was used keep their names and are
+    deleted directly.
+    """
+
+    @staticmethod
+    def blob_name(digest: str, name: str) -> str:
+        _, extension = os.path.splitext(name)
+        return (
+            f"{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/"
+            f"{digest}{extension.lower()}"
+        )
+
+    @staticmethod
+    def is_blob(name: str) -> bool:
+        return name.startswith(BLOB_PREFIX)
+
+    def _save(self, name: str, content) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = self.blob_name(digest.hexdigest(), name)
+
+        with transaction.atomic():
+            # The locked row keeps a concurrent delete of the last
+            # reference from removing the file being reused.
+            blob, _ = MediaBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={"size": content.size}
+            )
+            if not self.exists(name):
+                saved_name = super()._save(name, content)
+                if saved_name != name:
+                    # An identical upload was written meanwhile.
+                    super().delete(saved_name)
+            blob.refcount = F("refcount") + 1
+            blob.save(update_fields=["refcount"])
+        return name
+
+    def delete(self, name: str) -> None:
+        if not self.is_blob(name):
+            super().delete(name)
+            return
+
+        with transaction.atomic():
+            blob = (
+                MediaBlob.objects.select_for_update().filter(name=name).first()
+            )
+            if blob is None:
+                return
+            if blob.refcount > 1:
+                blob.refcount = F("refcount") - 1
+                blob.save(update_fields=["refcount"])
+                return
+            blob.delete()
+            super().delete(name)
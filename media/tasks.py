@@ -0,0 +1,95 @@
+import logging
+
+from celery import shared_task
+from django.apps import apps
+
+from media.models import RemoteImageStatus
+from media.remote import RemoteImageError, download_image
+from media.variants import (
+    build_variants,
+    needs_variants,
+    variant_file_names,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def fetch_remote_image(model_label: str, pk: int, field_name: str) -> None:
+    """
+    Download the image waiting at `<field_name>_source_url` of an instance
+    and attach it to `<field_name>`, recording the outcome in
+    `<field_name>_status`.
+    """
+    model = apps.get_model(model_label)
+    source_url_field = f"{field_name}_source_url"
+    status_field = f"{field_name}_status"
+
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    url = getattr(instance, source_url_field)
+    if getattr(instance, status_field) != RemoteImageStatus.PENDING:
+        return
+
+    try:
+        content = download_image(url)
+    except RemoteImageError as error:
+        logger.warning("Error downloading image %s: %s", url, error)
+        model.objects.filter(pk=pk, **{source_url_field: url}).update(
+            **{status_field: RemoteImageStatus.FAILED}
+        )
+        return
+
+    instance.refresh_from_db()
+    if getattr(instance, source_url_field) != url:
+        # Another image was set while this one was downloading.
+        return
+    getattr(instance, field_name).save(content.name, content, save=False)
+    setattr(instance, status_field, RemoteImageStatus.READY)
+    instance.save(update_fields=[field_name, status_field])
+    logger.info("Image %s attached to %s %s", url, model_label, pk)
+
+
+@shared_task
+def generate_image_variants(
+    model_label: str, pk: int, field_name: str
+) -> None:
+    """
+    Create the resized variants of `<field_name>` of an instance and store
+    them with the image dimensions and placeholder on the instance.
+
+    The files of the previous variants are released, so variants of
+    replaced and removed images don't linger in storage.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not needs_variants(instance, field_name):
+        return
+
+    field_file = getattr(instance, field_name)
+    storage = field_file.storage
+    source = field_file.name or ""
+    if field_file:
+        result = build_variants(field_file)
+    else:
+        result = {"width": None, "height": None, "placeholder": "",
+                  "variants": {}}
+
+    instance.refresh_from_db()
+    if (getattr(instance, field_name).name or "") != source:
+        # The image was replaced meanwhile, its own task will handle it.
+        for name in variant_file_names(result["variants"]):
+            storage.delete(name)
+        return
+    stale_names = variant_file_names(
+        getattr(instance, f"{field_name}_variants") or {}
+    )
+    for attribute, value in result.items():
+        setattr(instance, f"{field_name}_{attribute}", value)
+    instance.save(
+        update_fields=[f"{field_name}_{attribute}" for attribute in result]
+    )
+    for name in stale_names:
+        storage.delete(name)
+    logger.info("Image variants of %s %s created", model_label, pk)
@@ -0,0 +1,210 @@
+import hashlib
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from media.models import MediaBlob
+from media.parsers import MultiPartParser, RequestEntityTooLarge
+from media.storage import ContentAddressedStorage
+from media.views import RangeNotSatisfiable, parse_range
+from social_media_api.testing import create_user
+
+CONTENT = b"0123456789"
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + bytes(8)
+UPLOAD_LIMIT = 64
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self) -> None:
+        for header, expected in (
+            ("bytes=0-4", (0, 4)),
+            ("bytes=5-", (5, 9)),
+            ("bytes=5-100", (5, 9)),
+            ("bytes=-3", (7, 9)),
+            ("bytes=-100", (0, 9)),
+            ("bytes = 2 - 3", (2, 3)),
+        ):
+            with self.subTest(header):
+                self.assertEqual(parse_range(header, 10), expected)
+
+    def test_ignored_headers(self) -> None:
+        for header in ("bytes=-", "bytes=0-1,3-4", "items=0-1", "bytes=a-b"):
+            with self.subTest(header):
+                self.assertIsNone(parse_range(header, 10))
+
+    def test_unsatisfiable_ranges(self) -> None:
+        for header, size in (
+            ("bytes=10-", 10),
+            ("bytes=5-4", 10),
+            ("bytes=-0", 10),
+            ("bytes=0-", 0),
+            ("bytes=-5", 0),
+        ):
+            with self.subTest(header, size=size):
+                with self.assertRaises(RangeNotSatisfiable):
+                    parse_range(header, size)
+
+
+class MediaViewTests(TestCase):
+    def setUp(self) -> None:
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        media_settings = override_settings(
+            MEDIA_ROOT=root, MEDIA_SENDFILE_BACKEND=""
+        )
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        digest = hashlib.sha256(CONTENT).hexdigest()
+        self.blob = ContentAddressedStorage.blob_name(digest, "file.txt")
+        self.blob_etag = f'"{digest}"'
+        for name, content in (
+            (self.blob, CONTENT),
+            ("legacy.txt", CONTENT),
+            ("empty.txt", b""),
+        ):
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+        MediaBlob.objects.create(name=self.blob, size=len(CONTENT), refcount=1)
+
+    def get(self, name: str, **headers):
+        return self.client.get(reverse("media:media", args=[name]), **headers)
+
+    def test_whole_file(self) -> None:
+        response = self.get(self.blob)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["ETag"], self.blob_etag)
+
+    def test_range(self) -> None:
+        response = self.get(self.blob, HTTP_RANGE="bytes=2-4")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"234")
+        self.assertEqual(response["Content-Range"], "bytes 2-4/10")
+        self.assertEqual(response["Content-Length"], "3")
+
+    def test_suffix_range_of_empty_file(self) -> None:
+        response = self.get("empty.txt", HTTP_RANGE="bytes=-5")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */0")
+
+    def test_if_range(self) -> None:
+        matching = self.get(
+            self.blob, HTTP_RANGE="bytes=2-4", HTTP_IF_RANGE=self.blob_etag
+        )
+        stale = self.get(
+            self.blob, HTTP_RANGE="bytes=2-4", HTTP_IF_RANGE='"other"'
+        )
+
+        self.assertEqual(matching.status_code, 206)
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(b"".join(stale.streaming_content), CONTENT)
+
+    def test_revalidated_blob_needs_no_query(self) -> None:
+        with self.assertNumQueries(0):
+            response = self.get(self.blob, HTTP_IF_NONE_MATCH=self.blob_etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_unreferenced_blob_is_not_served(self) -> None:
+        MediaBlob.objects.filter(name=self.blob).update(refcount=0)
+
+        self.assertEqual(self.get(self.blob).status_code, 404)
+
+    def test_legacy_file_is_revalidated(self) -> None:
+        response = self.get("legacy.txt")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
+        self.assertEqual(
+            self.get(
+                "legacy.txt", HTTP_IF_NONE_MATCH=response["ETag"]
+            ).status_code,
+            304,
+        )
+
+    def test_hidden_names_are_not_served(self) -> None:
+        self.assertEqual(self.get(".env").status_code, 404)
+        self.assertEqual(self.get("blobs/../legacy.txt").status_code, 404)
+
+
+@override_settings(IMAGE_UPLOAD_LIMITS={"image": UPLOAD_LIMIT})
+class ImageUploadParserTests(SimpleTestCase):
+    def parse(self, content: bytes, field_name: str = "image"):
+        upload = SimpleUploadedFile("upload.png", content)
+        request = Request(
+            RequestFactory().post("/", {field_name: upload}),
+            parsers=[MultiPartParser()],
+        )
+        return request.data
+
+    def test_image_within_limit(self) -> None:
+        data = self.parse(PNG_HEADER + bytes(UPLOAD_LIMIT - len(PNG_HEADER)))
+
+        self.assertEqual(data["image"].size, UPLOAD_LIMIT)
+
+    def test_too_large_upload(self) -> None:
+        with self.assertRaises(RequestEntityTooLarge) as context:
+            self.parse(PNG_HEADER + bytes(UPLOAD_LIMIT))
+
+        self.assertEqual(context.exception.status_code, 413)
+
+    def test_upload_that_is_not_an_image(self) -> None:
+        for content in (bytes(UPLOAD_LIMIT), b"GIF"):
+            with self.subTest(content=content):
+                with self.assertRaises(ValidationError) as context:
+                    self.parse(content)
+
+                self.assertIn("image", context.exception.detail)
+
+    def test_fields_without_limit(self) -> None:
+        data = self.parse(bytes(UPLOAD_LIMIT * 2), field_name="document")
+
+        self.assertEqual(data["document"].size, UPLOAD_LIMIT * 2)
+
+
+@override_settings(
+    IMAGE_UPLOAD_LIMITS={"image": UPLOAD_LIMIT},
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class ImageUploadViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.client.force_authenticate(create_user())
+
+    def create_post(self, image: bytes):
+        return self.client.post(
+            reverse("post:post-list"),
+            {
+                "title": "Post",
+                "text": "Text",
+                "image": SimpleUploadedFile("image.png", image),
+            },
+            format="multipart",
+        )
+
+    def test_too_large_image(self) -> None:
+        response = self.create_post(PNG_HEADER + bytes(UPLOAD_LIMIT))
+
+        self.assertEqual(response.status_code, 413)
+
+    def test_invalid_image(self) -> None:
+        response = self.create_post(bytes(UPLOAD_LIMIT))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("image", response.data)
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+
+from media.formats import sniff_image_format
+
+# Number of leading bytes needed to recognize an image format.
+HEADER_SIZE = 16
+
+
+class ImageUploadError(MultiPartParserError):
+    def __init__(self, field_name: str, message: str) -> None:
+        super().__init__(message)
+        self.field_name = field_name
+
+
+class UploadTooLarge(ImageUploadError):
+    pass
+
+
+class InvalidImageUpload(ImageUploadError):
+    pass
+
+
+class ImageUploadLimitHandler(FileUploadHandler):
+    """
+    Upload handler that enforces the byte limits of `IMAGE_UPLOAD_LIMITS`
+    while chunks arrive and checks the image header of the first bytes.
+
+    It must come first in `FILE_UPLOAD_HANDLERS`: raising from it aborts
+    parsing before the following handlers buffer the rejected bytes.
+    """
+
+    def new_file(self, field_name: str, *args, **kwargs) -> None:
+        super().new_file(field_name, *args, **kwargs)
+        self.limit = settings.IMAGE_UPLOAD_LIMITS.get(field_name)
+        self.received = 0
+        self.header = b""
+        if self.limit is not None and (self.content_length or 0) > self.limit:
+            self._reject_size()
+
+    def _reject_size(self) -> None:
+        raise UploadTooLarge(
+            self.field_name,
+            f"Upload of '{self.field_name}' exceeds "
+            f"{self.limit / 1024 / 1024:g}MB",
+        )
+
+    def _check_header(self) -> None:
+        if sniff_image_format(self.header) is None:
+            raise InvalidImageUpload(
+                self.field_name,
+                "Upload a valid image. The file you uploaded was either not "
+                "an image or a corrupted image.",
+            )
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        if self.limit is None:
+            return raw_data
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            self._reject_size()
+        if len(self.header) < HEADER_SIZE:
+            self.header += raw_data[:HEADER_SIZE - len(self.header)]
+            if len(self.header) == HEADER_SIZE:
+                self._check_header()
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        if self.limit is not None and len(self.header) < HEADER_SIZE:
+            self._check_header()
+        return None
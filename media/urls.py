@@ -0,0 +1,9 @@
+from django.urls import path
+
+from media.views import MediaView
+
+urlpatterns = [
+    path("<path:name>", MediaView.as_view(), name="media"),
+]
+
+app_name = "media"
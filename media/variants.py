@@ -0,0 +1,109 @@
+"""
+Resized variants of uploaded images.
+
+Every variant is stored as WebP and JPEG, re-encoded from pixels only so
+EXIF and other metadata of the original never reach clients.
+"""
+import base64
+import io
+import os
+
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from PIL import Image, ImageOps
+
+# Longest side (in pixels) of every variant. Smaller images aren't upscaled.
+VARIANT_SIZES = {
+    "thumbnail": 160,
+    "feed": 640,
+    "full": 1280,
+}
+
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Side (in pixels) of the tiny image encoded as a placeholder.
+PLACEHOLDER_SIZE = 4
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def make_placeholder(image: Image.Image) -> str:
+    """
+    Encode the image downscaled to a few pixels, which clients can stretch
+    and blur while the real image loads.
+    """
+    tiny = image.resize((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX)
+    return base64.urlsafe_b64encode(tiny.tobytes()).decode()
+
+
+def build_variants(field_file: FieldFile) -> dict:
+    """
+    Create and store the variants of an image, and return its dimensions,
+    placeholder and the names of the stored variants.
+    """
+    storage = field_file.storage
+    with field_file.open("rb") as source:
+        image = _to_rgb(ImageOps.exif_transpose(Image.open(source)))
+
+    directory, file_name = os.path.split(field_file.name)
+    stem, _ = os.path.splitext(file_name)
+    sizes = {}
+    for variant, size in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        sizes[variant] = {}
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, image_format, **options)
+            name = f"{directory}/variants/{stem}-{variant}.{extension}"
+            sizes[variant][extension] = storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+
+    return {
+        "width": image.width,
+        "height": image.height,
+        "placeholder": make_placeholder(image),
+        "variants": {"source": field_file.name, "sizes": sizes},
+    }
+
+
+def needs_variants(instance, field_name: str) -> bool:
+    """
+    Tell whether the variants of an image field are missing or stale,
+    including variants left over from a removed image.
+    """
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, f"{field_name}_variants") or {}
+    return variants.get("source", "") != (field_file.name or "")
+
+
+def variant_file_names(variants: dict) -> list[str]:
+    """Return the names of the stored files of a variants record."""
+    return [
+        name
+        for formats in variants.get("sizes", {}).values()
+        for name in formats.values()
+    ]
+
+
+def image_file_names(instance, field_name: str) -> list[str]:
+    """
+    Return the names of the stored files an image field refers to: the
+    image and its variants. The image the variants were made from is
+    released when it's replaced (see `media.signals`), not with them.
+    """
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, f"{field_name}_variants") or {}
+    names = [field_file.name] if field_file else []
+    return names + variant_file_names(variants)
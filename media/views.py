@@ -0,0 +1,174 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.views import View
+
+from media.models import MediaBlob
+from media.storage import ContentAddressedStorage
+
+# Blobs never change, so clients and proxies may keep them forever.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Files under legacy names can be overwritten, so they're revalidated.
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class _FileRange:
+    """Read-only view of `length` bytes of a file starting at `start`."""
+
+    def __init__(self, file, start: int, length: int) -> None:
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Return the first and last byte of a single `bytes` range, or None when
+    the header is ignored. Multiple ranges are ignored, the whole file is
+    sent instead, as RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise RangeNotSatisfiable
+    return first, last
+
+
+class MediaView(View):
+    """
+    Serve uploaded files.
+
+    Django only decides whether a file may be served and answers
+    conditional requests. The transfer itself is handed to the front
+    proxy when MEDIA_SENDFILE_BACKEND is set, or streamed otherwise with
+    support for single byte ranges.
+    """
+
+    http_method_names = ["get", "head"]
+
+    def has_permission(self, request: HttpRequest, name: str) -> bool:
+        """
+        Tell whether a file may be served. Blobs are served only while
+        something still refers to them.
+        """
+        if ContentAddressedStorage.is_blob(name):
+            return MediaBlob.objects.filter(
+                name=name, refcount__gt=0
+            ).exists()
+        return True
+
+    @staticmethod
+    def get_path(name: str) -> str:
+        if any(part.startswith(".") for part in name.split("/")):
+            raise Http404
+        try:
+            path = default_storage.path(name)
+        except (SuspiciousFileOperation, ValueError):
+            raise Http404
+        if not os.path.isfile(path):
+            raise Http404
+        return path
+
+    @staticmethod
+    def get_etag(name: str, stat: os.stat_result) -> str:
+        if ContentAddressedStorage.is_blob(name):
+            digest, _ = os.path.splitext(os.path.basename(name))
+            return f'"{digest}"'
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def get(self, request: HttpRequest, name: str) -> HttpResponse:
+        path = self.get_path(name)
+        stat = os.stat(path)
+        etag = self.get_etag(name, stat)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": (
+                IMMUTABLE_CACHE_CONTROL
+                if ContentAddressedStorage.is_blob(name)
+                else REVALIDATE_CACHE_CONTROL
+            ),
+            "Accept-Ranges": "bytes",
+        }
+
+        # Answered before the permission check, which queries the database
+        # for blobs: the client already holds the content, which can't
+        # change under the same ETag.
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return HttpResponse(status=304, headers=headers)
+
+        if not self.has_permission(request, name):
+            raise Http404
+
+        content_type, _ = mimetypes.guess_type(name)
+        content_type = content_type or "application/octet-stream"
+
+        backend = settings.MEDIA_SENDFILE_BACKEND
+        if backend == "x-accel-redirect":
+            location = settings.MEDIA_ACCEL_REDIRECT_LOCATION.rstrip("/")
+            headers["X-Accel-Redirect"] = f"{location}/{quote(name)}"
+            return HttpResponse(content_type=content_type, headers=headers)
+        if backend == "x-sendfile":
+            headers["X-Sendfile"] = path
+            return HttpResponse(content_type=content_type, headers=headers)
+
+        byte_range = None
+        if_range = request.headers.get("If-Range")
+        if "Range" in request.headers and if_range in (None, etag):
+            try:
+                byte_range = parse_range(
+                    request.headers["Range"], stat.st_size
+                )
+            except RangeNotSatisfiable:
+                headers["Content-Range"] = f"bytes */{stat.st_size}"
+                return HttpResponse(status=416, headers=headers)
+
+        file = open(path, "rb")
+        if byte_range is None:
+            return FileResponse(
+                file, content_type=content_type, headers=headers
+            )
+        first, last = byte_range
+        length = last - first + 1
+        headers["Content-Range"] = f"bytes {first}-{last}/{stat.st_size}"
+        headers["Content-Length"] = str(length)
+        return FileResponse(
+            _FileRange(file, first, length),
+            status=206,
+            content_type=content_type,
+            headers=headers,
+        )
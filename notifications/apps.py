@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class NotificationsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "notifications"
+
+    def ready(self):
+        from notifications.tasks import start_post_fanouts
+        from outbox.events import POST_PUBLISHED
+        from outbox.relay import register_consumer
+
+        register_consumer(POST_PUBLISHED, start_post_fanouts.delay)
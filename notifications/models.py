@@ -0,0 +1,78 @@
+from django.db import models
+from django.db.models import Q
+
+from post.models import Post
+from users.models import User
+
+
+class NotificationVerb(models.TextChoices):
+    POST_PUBLISHED = "post_published", "Post published"
+
+
+class Notification(models.Model):
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notifications"
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="notifications"
+    )
+    verb = models.CharField(
+        max_length=20,
+        choices=NotificationVerb.choices,
+        db_comment="What happened to the post",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_comment="When the notification was created"
+    )
+    read_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_comment="When the recipient read the notification",
+    )
+
+    def __str__(self):
+        return f"{self.get_verb_display()}: {self.post_id} -> {self.recipient}"
+
+    class Meta:
+        ordering = ["-id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipient", "post", "verb"],
+                name="unique_notification",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["recipient", "-id"], name="notification_inbox_idx"
+            ),
+            models.Index(
+                fields=["recipient"],
+                condition=Q(read_at__isnull=True),
+                name="notification_unread_idx",
+            ),
+        ]
+
+
+class PostFanout(models.Model):
+    """
+    Progress of notifying the followers of a post's author, so a failed
+    chunk resumes after the last follower notified.
+    """
+
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, related_name="fanout"
+    )
+    last_follower_id = models.BigIntegerField(
+        default=0, db_comment="Id of the last follower notified"
+    )
+    notified = models.PositiveIntegerField(
+        default=0, db_comment="Number of followers notified so far"
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_comment="When every follower was notified",
+    )
+
+    def __str__(self):
+        return f"Fan-out of post {self.post_id} ({self.notified})"
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+from notifications.models import Notification
+from users.serializers import UserDisplayNameField
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    post_title = serializers.CharField(source="post.title", read_only=True)
+    author = UserDisplayNameField("owner", source="post")
+
+    class Meta:
+        model = Notification
+        fields = [
+            "id",
+            "verb",
+            "post",
+            "post_title",
+            "author",
+            "created_at",
+            "read_at",
+        ]
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    """Ids of the notifications to mark read, all of them when omitted."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False
+    )
@@ -0,0 +1,80 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationVerb, PostFanout
+from post.models import Post
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def start_post_fanouts(messages: list[dict]) -> None:
+    """Start notifying followers about the posts of post.published events."""
+    post_ids = [message["payload"]["post_id"] for message in messages]
+    existing_ids = set(Post.objects.filter(id__in=post_ids).values_list(
+        "id", flat=True
+    ))
+    PostFanout.objects.bulk_create(
+        [PostFanout(post_id=post_id) for post_id in existing_ids],
+        ignore_conflicts=True,
+    )
+    for post_id in existing_ids:
+        fan_out_post.delay(post_id)
+
+
+@shared_task
+def fan_out_post(post_id: int) -> None:
+    """
+    Notify the next chunk of followers of a post's author, then queue the
+    following chunk.
+
+    Every chunk is written in one transaction with the fan-out checkpoint,
+    so a retried or redelivered chunk neither skips nor repeats followers.
+    """
+    chunk_size = settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    with transaction.atomic():
+        fanout = (
+            PostFanout.objects.select_for_update()
+            .select_related("post")
+            .filter(post_id=post_id, completed_at__isnull=True)
+            .first()
+        )
+        if fanout is None:
+            return
+        follower_ids = list(
+            User.followers.through.objects.filter(
+                from_user_id=fanout.post.owner_id,
+                to_user_id__gt=fanout.last_follower_id,
+            )
+            .order_by("to_user_id")
+            .values_list("to_user_id", flat=True)[:chunk_size]
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient_id=follower_id,
+                    post_id=post_id,
+                    verb=NotificationVerb.POST_PUBLISHED,
+                )
+                for follower_id in follower_ids
+            ],
+            ignore_conflicts=True,
+        )
+        if follower_ids:
+            fanout.last_follower_id = follower_ids[-1]
+            fanout.notified += len(follower_ids)
+        if len(follower_ids) < chunk_size:
+            fanout.completed_at = timezone.now()
+        fanout.save()
+
+    if fanout.completed_at is None:
+        fan_out_post.delay(post_id)
+    else:
+        logger.info(
+            "Notified %s followers about post %s", fanout.notified, post_id
+        )
@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from notifications.models import Notification, NotificationVerb, PostFanout
+from notifications.tasks import fan_out_post, start_post_fanouts
+from post.models import Post
+from social_media_api.testing import create_user, sequence
+
+TEST_SETTINGS = {
+    "CACHES": {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+    "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+}
+
+
+def create_post(owner) -> Post:
+    return Post.objects.create(
+        title=f"Post {next(sequence)}", text="Text", owner=owner
+    )
+
+
+@override_settings(**TEST_SETTINGS, NOTIFICATION_FANOUT_CHUNK_SIZE=2)
+class PostFanoutTests(TestCase):
+    def setUp(self) -> None:
+        self.author = create_user()
+        self.followers = [create_user() for _ in range(5)]
+        self.author.followers.add(*self.followers)
+        self.post = create_post(self.author)
+
+    def run_fanout(self) -> int:
+        """Run the chunks of the fan-out until it completes."""
+        chunks = 0
+        with mock.patch.object(fan_out_post, "delay") as delay:
+            start_post_fanouts([{"payload": {"post_id": self.post.id}}])
+            delay.reset_mock()
+            while True:
+                fan_out_post(self.post.id)
+                chunks += 1
+                if not delay.called:
+                    break
+                delay.reset_mock()
+        return chunks
+
+    def recipient_ids(self) -> list:
+        return sorted(
+            Notification.objects.filter(post=self.post).values_list(
+                "recipient_id", flat=True
+            )
+        )
+
+    def test_every_follower_is_notified_in_chunks(self) -> None:
+        self.assertEqual(self.run_fanout(), 3)
+
+        self.assertEqual(
+            self.recipient_ids(), sorted(user.id for user in self.followers)
+        )
+        fanout = PostFanout.objects.get(post=self.post)
+        self.assertIsNotNone(fanout.completed_at)
+        self.assertEqual(fanout.notified, 5)
+        self.assertEqual(fanout.last_follower_id, max(self.recipient_ids()))
+
+    def test_chunk_resumes_after_checkpoint(self) -> None:
+        PostFanout.objects.create(post=self.post)
+        with mock.patch.object(fan_out_post, "delay") as delay:
+            fan_out_post(self.post.id)
+
+        delay.assert_called_once_with(self.post.id)
+        fanout = PostFanout.objects.get(post=self.post)
+        first_ids = sorted(user.id for user in self.followers)[:2]
+        self.assertEqual(fanout.last_follower_id, first_ids[-1])
+        self.assertEqual(self.recipient_ids(), first_ids)
+
+    def test_redelivered_chunks_notify_once(self) -> None:
+        self.run_fanout()
+        # A chunk delivered again after the fan-out completed, and one
+        # whose checkpoint was lost.
+        with mock.patch.object(fan_out_post, "delay"):
+            fan_out_post(self.post.id)
+        PostFanout.objects.filter(post=self.post).update(
+            last_follower_id=0, completed_at=None
+        )
+        with mock.patch.object(fan_out_post, "delay"):
+            fan_out_post(self.post.id)
+
+        self.assertEqual(
+            self.recipient_ids(), sorted(user.id for user in self.followers)
+        )
+
+    def test_fanout_is_started_once_per_post(self) -> None:
+        self.run_fanout()
+        with mock.patch.object(fan_out_post, "delay"):
+            start_post_fanouts([{"payload": {"post_id": self.post.id}}])
+
+        self.assertEqual(PostFanout.objects.filter(post=self.post).count(), 1)
+        self.assertIsNotNone(
+            PostFanout.objects.get(post=self.post).completed_at
+        )
+
+
+@override_settings(**TEST_SETTINGS)
+class NotificationViewTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        author = create_user()
+        self.notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                post=create_post(author),
+                verb=NotificationVerb.POST_PUBLISHED,
+            )
+            for _ in range(3)
+        ])
+        Notification.objects.create(
+            recipient=author,
+            post=create_post(self.user),
+            verb=NotificationVerb.POST_PUBLISHED,
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_counts_unread(self) -> None:
+        response = self.client.get(reverse("notifications:list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["unread_count"], 3)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_mark_read_by_ids(self) -> None:
+        response = self.client.post(
+            reverse("notifications:read"),
+            {"ids": [self.notifications[0].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["unread_count"], 2)
+        self.notifications[0].refresh_from_db()
+        self.assertIsNotNone(self.notifications[0].read_at)
+
+    def test_mark_all_read(self) -> None:
+        response = self.client.post(
+            reverse("notifications:read"), {}, format="json"
+        )
+
+        self.assertEqual(response.data["unread_count"], 0)
+        self.assertEqual(
+            self.client.get(reverse("notifications:list")).data[
+                "unread_count"
+            ],
+            0,
+        )
+        # Notifications of other users are left unread.
+        self.assertTrue(
+            Notification.objects.filter(read_at__isnull=True).exists()
+        )
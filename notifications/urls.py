@@ -0,0 +1,10 @@
+from django.urls import path
+
+from notifications.views import NotificationListView, NotificationMarkReadView
+
+urlpatterns = [
+    path("", NotificationListView.as_view(), name="list"),
+    path("read/", NotificationMarkReadView.as_view(), name="read"),
+]
+
+app_name = "notifications"
@@ -0,0 +1,102 @@
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils import timezone
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    inline_serializer,
+)
+from rest_framework import generics, serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from notifications.models import Notification
+from notifications.serializers import (
+    NotificationMarkReadSerializer,
+    NotificationSerializer,
+)
+
+UnreadCountSerializer = inline_serializer(
+    name="UnreadCount", fields={"unread_count": serializers.IntegerField()}
+)
+
+
+def unread_notifications(user) -> QuerySet:
+    return Notification.objects.filter(recipient=user, read_at__isnull=True)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="List my notifications",
+        description="Retrieve a paginated list of notifications of the "
+                    "current authenticated user, newest first, with the "
+                    "number of unread ones in `unread_count`.",
+        tags=["Manage profile"],
+    ),
+)
+class NotificationListView(generics.ListAPIView):
+    """
+    API endpoint that lists the notifications of the current user.
+    """
+
+    serializer_class = NotificationSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet:
+        return (
+            Notification.objects.filter(recipient=self.request.user)
+            .select_related("post__owner")
+            .only(
+                "id",
+                "verb",
+                "created_at",
+                "read_at",
+                "post__id",
+                "post__title",
+                "post__owner__id",
+                "post__owner__first_name",
+                "post__owner__last_name",
+                "post__owner__username",
+                "post__owner__email",
+            )
+        )
+
+    def list(self, request: HttpRequest, *args, **kwargs) -> Response:
+        response = super().list(request, *args, **kwargs)
+        response.data["unread_count"] = unread_notifications(
+            request.user
+        ).count()
+        return response
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="Mark my notifications read",
+        description="Mark the given notifications of the current "
+                    "authenticated user read, or all of them when no ids "
+                    "are given.",
+        tags=["Manage profile"],
+        responses={200: UnreadCountSerializer},
+    ),
+)
+class NotificationMarkReadView(generics.GenericAPIView):
+    """
+    API endpoint that marks notifications of the current user read.
+    """
+
+    serializer_class = NotificationMarkReadSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request: HttpRequest) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        notifications = unread_notifications(request.user)
+        if "ids" in serializer.validated_data:
+            notifications = notifications.filter(
+                id__in=serializer.validated_data["ids"]
+            )
+        notifications.update(read_at=timezone.now())
+        return Response(
+            {"unread_count": unread_notifications(request.user).count()},
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,32 @@
+"""
+Domain events recorded in the outbox.
+
+Events must be published inside the transaction of the change they
+describe, so an event exists if and only if the change was committed.
+"""
+from django.db import transaction
+
+from outbox.models import OutboxEvent
+
+POST_PUBLISHED = "post.published"
+POST_SCHEDULED = "post.scheduled"
+POST_LIKED = "post.liked"
+POST_UNLIKED = "post.unliked"
+USER_FOLLOWED = "user.followed"
+USER_UNFOLLOWED = "user.unfollowed"
+
+
+def publish(topic: str, **payload) -> None:
+    """Record an event in the outbox within the current transaction."""
+    publish_many(topic, [payload])
+
+
+def publish_many(topic: str, payloads: list[dict]) -> None:
+    """Record events of one topic in the outbox with a single query."""
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError(
+            "Outbox events must be published inside transaction.atomic()"
+        )
+    OutboxEvent.objects.bulk_create(
+        OutboxEvent(topic=topic, payload=payload) for payload in payloads
+    )
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from outbox.relay import relay_batch
+
+
+class Command(BaseCommand):
+    """
+    Django command that relays outbox events continuously, as an
+    alternative to the periodic relay_outbox task
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = relay_batch()
+            if count == settings.OUTBOX_RELAY_BATCH_SIZE:
+                continue
+            if options["once"]:
+                return
+            time.sleep(settings.OUTBOX_RELAY_INTERVAL)
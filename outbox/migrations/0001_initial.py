@@ -0,0 +1,38 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "topic",
+                    models.CharField(
+                        db_comment="Name of the event, e.g. post.published",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        db_comment="Ids of the objects the event is about", default=dict
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_comment="When the event was recorded"
+                    ),
+                ),
+            ],
+        ),
+    ]
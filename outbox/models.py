@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    A domain event written in the transaction of the change it describes,
+    and delivered to its consumers by the relay once committed.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(
+        max_length=100, db_comment="Name of the event, e.g. post.published"
+    )
+    payload = models.JSONField(
+        default=dict, db_comment="Ids of the objects the event is about"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_comment="When the event was recorded"
+    )
+
+    def __str__(self):
+        return f"{self.topic} #{self.id}"
+
+    def as_message(self) -> dict:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "payload": self.payload,
+            "created_at": self.created_at.isoformat(),
+        }
@@ -0,0 +1,81 @@
+"""
+Delivery of committed outbox events to their consumers.
+
+Events are delivered in batches ordered by id, at least once: a batch is
+deleted only after every consumer accepted it, so consumers must be
+idempotent.
+"""
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from outbox.models import OutboxEvent
+from social_media_api.cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Key of the Postgres advisory lock letting a single relay run at a time,
+# which keeps events in order.
+RELAY_LOCK_ID = 0x6F7574626F78
+
+_consumers = defaultdict(list)
+
+
+def register_consumer(topic: str, consumer) -> None:
+    """
+    Register a callable receiving the list of messages of every relayed
+    batch of `topic`. Pass a Celery task's `delay` to consume in workers.
+    """
+    _consumers[topic].append(consumer)
+
+
+def _acquire_relay_lock() -> bool:
+    if connection.vendor != "postgresql":
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [RELAY_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def _deliver(messages: list[dict]) -> None:
+    by_topic = defaultdict(list)
+    for message in messages:
+        by_topic[message["topic"]].append(message)
+    for topic, topic_messages in by_topic.items():
+        for consumer in _consumers[topic]:
+            consumer(topic_messages)
+
+    stream = settings.OUTBOX_REDIS_STREAM
+    if stream:
+        pipeline = get_redis().pipeline()
+        for message in messages:
+            pipeline.xadd(
+                stream,
+                {"message": json.dumps(message)},
+                maxlen=settings.OUTBOX_REDIS_STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipeline.execute()
+
+
+def relay_batch(batch_size: int | None = None) -> int:
+    """
+    Deliver the oldest pending events and delete them. Return how many
+    were delivered, 0 when another relay holds the lock.
+    """
+    batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+    with transaction.atomic():
+        if not _acquire_relay_lock():
+            return 0
+        events = list(OutboxEvent.objects.order_by("id")[:batch_size])
+        if not events:
+            return 0
+        _deliver([event.as_message() for event in events])
+        OutboxEvent.objects.filter(
+            id__in=[event.id for event in events]
+        ).delete()
+    logger.info("Relayed %s outbox events", len(events))
+    return len(events)
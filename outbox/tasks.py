@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.conf import settings
+
+from outbox.relay import relay_batch
+
+
+@shared_task
+def relay_outbox() -> int:
+    """Relay pending outbox events until the outbox is drained."""
+    relayed = 0
+    while True:
+        count = relay_batch()
+        relayed += count
+        if count < settings.OUTBOX_RELAY_BATCH_SIZE:
+            return relayed
@@ -0,0 +1,151 @@
+import json
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from outbox import relay
+from outbox.events import (
+    POST_LIKED,
+    POST_UNLIKED,
+    USER_FOLLOWED,
+    USER_UNFOLLOWED,
+    publish,
+)
+from outbox.models import OutboxEvent
+from outbox.relay import RELAY_LOCK_ID, relay_batch
+from post.models import Post
+from social_media_api.cache import get_redis
+from social_media_api.testing import create_user, sequence
+
+TOPIC = "test.event"
+
+TEST_SETTINGS = {
+    "CACHES": {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+    "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+    "OUTBOX_REDIS_STREAM": "",
+}
+
+
+class PublishTests(SimpleTestCase):
+    def test_publish_outside_transaction(self) -> None:
+        with self.assertRaises(RuntimeError):
+            publish(TOPIC, post_id=1)
+
+
+@override_settings(**TEST_SETTINGS)
+class RelayTests(TestCase):
+    def setUp(self) -> None:
+        self.consumer = mock.Mock()
+        patcher = mock.patch.dict(relay._consumers, {TOPIC: [self.consumer]})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for index in range(3):
+            publish(TOPIC, post_id=index)
+
+    def test_relay_delivers_in_order_and_deletes(self) -> None:
+        self.assertEqual(relay_batch(batch_size=2), 2)
+
+        messages = self.consumer.call_args.args[0]
+        self.assertEqual(
+            [message["payload"] for message in messages],
+            [{"post_id": 0}, {"post_id": 1}],
+        )
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list("payload", flat=True)),
+            [{"post_id": 2}],
+        )
+        self.assertEqual(relay_batch(batch_size=2), 1)
+        self.assertEqual(relay_batch(batch_size=2), 0)
+        self.assertEqual(self.consumer.call_count, 2)
+
+    def test_failed_delivery_keeps_events(self) -> None:
+        self.consumer.side_effect = RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            relay_batch()
+
+        self.assertEqual(OutboxEvent.objects.count(), 3)
+
+    def test_relay_skips_while_another_holds_the_lock(self) -> None:
+        with mock.patch.object(
+            relay, "_acquire_relay_lock", return_value=False
+        ):
+            self.assertEqual(relay_batch(), 0)
+
+        self.consumer.assert_not_called()
+        self.assertEqual(OutboxEvent.objects.count(), 3)
+
+    @skipUnless(connection.vendor == "postgresql", "advisory locks")
+    def test_advisory_lock_excludes_other_relays(self) -> None:
+        other = connection.copy()
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", [RELAY_LOCK_ID])
+            self.assertEqual(relay_batch(), 0)
+        finally:
+            other.close()
+        self.assertEqual(relay_batch(), 3)
+
+    def test_relay_to_redis_stream(self) -> None:
+        stream = f"test-outbox-{next(sequence)}"
+        self.addCleanup(get_redis().delete, stream)
+
+        with override_settings(OUTBOX_REDIS_STREAM=stream):
+            relay_batch()
+
+        messages = [
+            json.loads(fields[b"message"])
+            for _, fields in get_redis().xrange(stream)
+        ]
+        self.assertEqual(
+            [message["payload"] for message in messages],
+            [{"post_id": 0}, {"post_id": 1}, {"post_id": 2}],
+        )
+
+
+@override_settings(**TEST_SETTINGS)
+class InteractionEventTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.author = create_user()
+        self.post = Post.objects.create(
+            title=f"Post {next(sequence)}", text="Text", owner=self.author
+        )
+        self.client.force_authenticate(self.user)
+
+    def events(self) -> list:
+        return list(
+            OutboxEvent.objects.order_by("id").values_list("topic", "payload")
+        )
+
+    def test_like_and_unlike(self) -> None:
+        for name in ("like", "unlike", "unlike"):
+            self.client.get(reverse(f"post:post-{name}", args=[self.post.id]))
+
+        payload = {
+            "post_id": self.post.id,
+            "owner_id": self.author.id,
+            "user_id": self.user.id,
+        }
+        self.assertEqual(
+            self.events(), [(POST_LIKED, payload), (POST_UNLIKED, payload)]
+        )
+
+    def test_subscribe_and_unsubscribe(self) -> None:
+        for name in ("subscribe", "subscribe", "unsubscribe"):
+            self.client.get(
+                reverse(f"users:user-{name}", args=[self.author.id])
+            )
+
+        payload = {"follower_id": self.user.id, "user_id": self.author.id}
+        self.assertEqual(
+            self.events(),
+            [(USER_FOLLOWED, payload), (USER_UNFOLLOWED, payload)],
+        )
@@ -0,0 +1,160 @@
+"""
+Response cache for anonymous reads of posts.
+
+Keys are built from the normalized request URL, and every entry is stored
+with the generations of the data the response depends on:
+
+* ``post:<id>`` for the detail page of a post;
+* ``tag:<tag>`` for lists filtered by hashtags;
+* ``post:list`` for every other list;
+* ``post:owners`` for every response, bumped when all the posts of a user
+  are hidden at once.
+
+Signal handlers in ``post.signals`` bump these generations, so a like or a
+new comment only invalidates the pages that actually show that post. An
+invalidated page is recomputed by a single worker while the others keep
+serving the previous version for a moment.
+
+It also holds the two-tier cache of existing hashtags, which lets the post
+serializers validate hashtags without a query per tag, and the negative
+cache of post ids that don't exist.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import router, transaction
+from rest_framework import permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from post.models import Hashtag, Post
+from social_media_api.cache import (
+    MissingObjectCache,
+    TwoTierCache,
+    bump_generations,
+    get_generations,
+    get_or_compute,
+)
+
+RESPONSE_CACHE_PREFIX = "post:response"
+POST_LIST_GENERATION = "post:list"
+POST_OWNERS_GENERATION = "post:owners"
+
+existing_hashtags = TwoTierCache("hashtag-exists", maxsize=4096)
+missing_posts = MissingObjectCache("post")
+
+
+def post_generation(post_id: int | str) -> str:
+    return f"post:{post_id}"
+
+
+def tag_generation(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def parse_hashtags(qr_params: str) -> list:
+    return sorted(
+        {hashtag.strip().lower() for hashtag in qr_params.split(",")} - {""}
+    )
+
+
+def hashtag_exists(tag: str) -> bool:
+    return existing_hashtags.get_or_set(
+        tag, lambda: Hashtag.objects.filter(tag=tag).exists()
+    )
+
+
+def get_cached_hashtag(tag: str) -> Hashtag | None:
+    """
+    Return a hashtag known to exist without querying the database, or None.
+    """
+    if not hashtag_exists(tag):
+        return None
+    return Hashtag.from_db(router.db_for_read(Hashtag), ["tag"], [tag])
+
+
+def invalidate_posts(post_ids, tags=()) -> None:
+    """
+    Invalidate cached responses showing the given posts once the current
+    transaction commits, so a concurrent reader can't cache old rows under
+    the new generation.
+    """
+    post_ids = set(post_ids)
+    tags = set(tags)
+    if post_ids:
+        tags.update(
+            Post.hashtags.through.objects.filter(
+                post_id__in=post_ids
+            ).values_list("hashtag_id", flat=True)
+        )
+    names = [POST_LIST_GENERATION]
+    names += [post_generation(post_id) for post_id in post_ids]
+    names += [tag_generation(tag) for tag in tags]
+    transaction.on_commit(lambda: bump_generations(*names))
+
+
+class PostResponseCacheMixin:
+    """
+    Serve ``list`` and ``retrieve`` of anonymous users from the cache.
+
+    Authenticated users always hit the database, because some responses
+    depend on who is asking.
+    """
+
+    response_cache_timeout = settings.POST_RESPONSE_CACHE_TIMEOUT
+
+    def _is_response_cacheable(self, request: Request) -> bool:
+        return (
+            request.method in permissions.SAFE_METHODS
+            and not request.user.is_authenticated
+        )
+
+    def _get_response_generations(self) -> list:
+        if self.action == "retrieve":
+            names = [post_generation(self.kwargs[self.lookup_field])]
+        elif hashtags := self.request.query_params.get("hashtag"):
+            names = [tag_generation(tag) for tag in parse_hashtags(hashtags)]
+        else:
+            names = [POST_LIST_GENERATION]
+        return names + [POST_OWNERS_GENERATION]
+
+    def get_response_cache_key(self) -> str:
+        params = []
+        for name, values in sorted(self.request.query_params.lists()):
+            if name == "hashtag":
+                values = [",".join(parse_hashtags(",".join(values)))]
+            params += [(name, value) for value in sorted(values)]
+        url = (
+            f"{self.request.get_host()}{self.request.path}?{urlencode(params)}"
+        )
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return f"{RESPONSE_CACHE_PREFIX}:{self.action}:{digest}"
+
+    def _cached_response(self, handler, request, *args, **kwargs) -> Response:
+        if not self._is_response_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        response = None
+
+        def render() -> dict | None:
+            nonlocal response
+            response = handler(request, *args, **kwargs)
+            return response.data if response.status_code == 200 else None
+
+        generations = get_generations(*self._get_response_generations())
+        data = get_or_compute(
+            self.get_response_cache_key(),
+            render,
+            timeout=self.response_cache_timeout,
+            version=sorted(generations.items()),
+        )
+        return response if response is not None else Response(data)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self._cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from social_media_api.cache import STATS_KEY_PREFIX, get_redis
+
+
+class Command(BaseCommand):
+    """Django command that prints hit/miss counters of two-tier caches"""
+
+    def handle(self, *args, **options):
+        client = get_redis()
+        for key in sorted(client.scan_iter(f"{STATS_KEY_PREFIX}:*")):
+            name = key.decode().removeprefix(f"{STATS_KEY_PREFIX}:")
+            stats = {
+                counter.decode(): int(value)
+                for counter, value in client.hgetall(key).items()
+            }
+            local_hits = stats.get("local_hits", 0)
+            redis_hits = stats.get("redis_hits", 0)
+            lookups = local_hits + stats.get("local_misses", 0)
+            self.stdout.write(
+                f"{name}: local {local_hits}/{lookups} hits, "
+                f"redis {redis_hits}/{stats.get('local_misses', 0)} hits"
+            )
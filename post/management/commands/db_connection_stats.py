@@ -0,0 +1,30 @@
+from django.core.management import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    """
+    Django command that prints the server connections of the database by
+    application and state, and the pool of this process when pooling is on
+    """
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT application_name, state, count(*) "
+                "FROM pg_stat_activity WHERE datname = current_database() "
+                "GROUP BY application_name, state ORDER BY 3 DESC"
+            )
+            rows = cursor.fetchall()
+            cursor.execute("SHOW max_connections")
+            max_connections = cursor.fetchone()[0]
+
+        self.stdout.write(f"max_connections: {max_connections}")
+        for application_name, state, count in rows:
+            self.stdout.write(
+                f"{application_name or '-'} ({state or 'background'}): "
+                f"{count}"
+            )
+        if hasattr(connection, "pool_stats"):
+            for name, value in sorted(connection.pool_stats().items()):
+                self.stdout.write(f"pool {name}: {value}")
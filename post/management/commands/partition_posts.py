@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from post.partitioning import (
+    UNPARTITIONED_TABLE,
+    convert_to_partitioned,
+    create_partitions,
+    detach_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command that partitions the posts table by creation month,
+    creates the partitions of the coming months and detaches old ones
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert post_post to a partitioned table. The table is "
+                 "locked while posts are copied.",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.POST_PARTITION_MONTHS_AHEAD,
+            help="Months of partitions to create ahead of time.",
+        )
+        parser.add_argument(
+            "--detach-older-than",
+            type=int,
+            metavar="MONTHS",
+            help="Detach the partitions of months ending more than MONTHS "
+                 "months ago.",
+        )
+        parser.add_argument(
+            "--archive-schema",
+            help="Move detached partitions to this schema.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop detached partitions.",
+        )
+
+    def handle(self, *args, **options):
+        if options["convert"]:
+            if is_partitioned():
+                raise CommandError("post_post is already partitioned.")
+            copied = convert_to_partitioned(options["months_ahead"])
+            self.stdout.write(
+                f"Copied {copied} posts to the partitioned table. Drop "
+                f"{UNPARTITIONED_TABLE} once the copy is checked."
+            )
+        elif not is_partitioned():
+            raise CommandError(
+                "post_post isn't partitioned, run with --convert first."
+            )
+
+        for name in create_partitions(options["months_ahead"]):
+            self.stdout.write(f"Created {name}")
+
+        if options["detach_older_than"] is not None:
+            for name in detach_partitions(
+                options["detach_older_than"],
+                archive_schema=options["archive_schema"],
+                drop=options["drop"],
+            ):
+                self.stdout.write(f"Detached {name}")
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0002_post_scheduled_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_source_url",
+            field=models.URLField(
+                blank=True,
+                db_comment="The remote URL the image of the post is fetched from",
+                max_length=2000,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                db_comment="The state of fetching the image from its remote URL",
+                default="",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0003_post_image_source_url_post_image_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_height",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_comment="The height of the image in pixels",
+                editable=False,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_placeholder",
+            field=models.CharField(
+                blank=True,
+                db_comment="A few pixels of the image shown while it loads",
+                default="",
+                editable=False,
+                max_length=100,
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True,
+                db_comment="The resized variants of the image",
+                default=dict,
+                editable=False,
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="image_width",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_comment="The width of the image in pixels",
+                editable=False,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0004_post_image_height_post_image_placeholder_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="state",
+            field=models.CharField(
+                choices=[("scheduled", "Scheduled"), ("published", "Published")],
+                db_comment="Whether the post is published or waits for its scheduled date",
+                default="published",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="scheduled_date",
+            field=models.DateTimeField(
+                blank=True,
+                db_comment="The date and time when the post is scheduled to be published",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["state", "scheduled_date"], name="post_post_state_00a13c_idx"
+            ),
+        ),
+    ]
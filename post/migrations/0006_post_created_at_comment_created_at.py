@@ -0,0 +1,150 @@
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models.functions import Cast, Coalesce, Now, TruncDate
+
+# Rows updated per statement while backfilling, every batch is committed
+# on its own so the tables are never locked for long.
+BACKFILL_BATCH_SIZE = 10000
+
+MODEL_NAMES = ("Post", "Comment")
+
+
+def _in_batches(model, using: str):
+    last_id = model.objects.using(using).aggregate(Max("id"))["id__max"] or 0
+    for start in range(0, last_id + 1, BACKFILL_BATCH_SIZE):
+        yield model.objects.using(using).filter(
+            id__gte=start, id__lt=start + BACKFILL_BATCH_SIZE
+        )
+
+
+def copy_created_date(apps, schema_editor) -> None:
+    using = schema_editor.connection.alias
+    for model_name in MODEL_NAMES:
+        model = apps.get_model("post", model_name)
+        for batch in _in_batches(model, using):
+            batch.filter(created_at__isnull=True).update(
+                created_at=Cast("created_date", models.DateTimeField())
+            )
+
+
+def fill_missing_created_at(apps, schema_editor) -> None:
+    # Rows the batches may have missed, checked right before the column
+    # becomes NOT NULL.
+    using = schema_editor.connection.alias
+    for model_name in MODEL_NAMES:
+        model = apps.get_model("post", model_name)
+        missing = model.objects.using(using).filter(created_at__isnull=True)
+        while ids := list(
+            missing.values_list("id", flat=True)[:BACKFILL_BATCH_SIZE]
+        ):
+            model.objects.using(using).filter(id__in=ids).update(
+                created_at=Coalesce(
+                    Cast("created_date", models.DateTimeField()), Now()
+                )
+            )
+
+
+def copy_created_at(apps, schema_editor) -> None:
+    using = schema_editor.connection.alias
+    for model_name in MODEL_NAMES:
+        model = apps.get_model("post", model_name)
+        for batch in _in_batches(model, using):
+            batch.update(created_date=TruncDate("created_at"))
+
+
+class Migration(migrations.Migration):
+    # The backfill commits batch by batch.
+    atomic = False
+
+    dependencies = [
+        ("post", "0005_post_state_alter_post_scheduled_date_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="created_at",
+            field=models.DateTimeField(
+                db_comment="The date and time when the comment was created",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="created_at",
+            field=models.DateTimeField(
+                db_comment="The date and time when the post was created",
+                null=True,
+            ),
+        ),
+        # The default is only set once the columns exist, so existing rows
+        # are left NULL for the backfill, and rows inserted meanwhile by
+        # code unaware of created_at get one.
+        migrations.AlterField(
+            model_name="comment",
+            name="created_at",
+            field=models.DateTimeField(
+                db_comment="The date and time when the comment was created",
+                db_default=Now(),
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="created_at",
+            field=models.DateTimeField(
+                db_comment="The date and time when the post was created",
+                db_default=Now(),
+                null=True,
+            ),
+        ),
+        # Code unaware of created_date may insert rows until 0009 drops it.
+        migrations.AlterField(
+            model_name="comment",
+            name="created_date",
+            field=models.DateField(
+                auto_now_add=True,
+                db_comment="The date when the comment was created",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="created_date",
+            field=models.DateField(
+                auto_now_add=True,
+                db_comment="The date when the post was created",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(copy_created_date, copy_created_at),
+        migrations.RunPython(
+            fill_missing_created_at, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="comment",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_comment="The date and time when the comment was created",
+                db_default=Now(),
+            ),
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_comment="The date and time when the post was created",
+                db_default=Now(),
+            ),
+        ),
+        migrations.AlterModelOptions(
+            name="comment",
+            options={"ordering": ["created_at", "id"]},
+        ),
+        migrations.AlterModelOptions(
+            name="post",
+            options={"ordering": ["-created_at", "id"]},
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently, which can't run in a transaction,
+    # so writes to the tables aren't blocked while they are built.
+    atomic = False
+
+    dependencies = [
+        ("post", "0006_post_created_at_comment_created_at"),
+    ]
+
+    operations = [
+        # Duplicates the index of the primary key.
+        RemoveIndexConcurrently(
+            model_name="hashtag",
+            name="post_hashta_tag_ca6162_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["created_at", "id"],
+                name="post_commen_created_293d55_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["owner", "-created_at", "id"],
+                name="post_post_owner_i_9b5ce1_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "id"],
+                name="post_post_created_2cb3b2_idx",
+            ),
+        ),
+    ]
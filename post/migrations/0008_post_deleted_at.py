@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("post", "0007_post_created_at_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_comment="When the post was deleted, its rows are purged in the background",
+                editable=False,
+                null=True,
+            ),
+        ),
+    ]
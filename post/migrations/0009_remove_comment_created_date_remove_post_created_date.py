@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Separate from 0006, so code still writing created_date keeps working
+    # until it is replaced.
+
+    dependencies = [
+        ("post", "0008_post_deleted_at"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="comment",
+            name="created_date",
+        ),
+        migrations.RemoveField(
+            model_name="post",
+            name="created_date",
+        ),
+    ]
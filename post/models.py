@@ -2,9 +2,14 @@ from __future__ import annotations
 
 import os
 import uuid
+from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Now
+from django.utils import timezone
 
+from media.models import RemoteImageStatus
 from users.models import User
 
 
@@ -22,9 +27,6 @@ class Hashtag(models.Model):
 
     class Meta:
         ordering = ["tag"]
-        indexes = [
-            models.Index(fields=["-tag"]),
-        ]
 
 
 class Comment(models.Model):
@@ -33,9 +35,10 @@ class Comment(models.Model):
         db_comment="The content of the comment",
         help_text="Enter the content of the comment, up to 300 characters"
     )
-    created_date = models.DateField(
+    created_at = models.DateTimeField(
         auto_now_add=True,
-        db_comment="The date when the comment was created",
+        db_default=Now(),
+        db_comment="The date and time when the comment was created",
     )
     owner = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="comments"
@@ -44,6 +47,58 @@ class Comment(models.Model):
     def __str__(self):
         return f"{self.text} ({self.owner})"
 
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+        ]
+
+
+class PostState(models.TextChoices):
+    SCHEDULED = "scheduled", "Scheduled"
+    PUBLISHED = "published", "Published"
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self) -> PostQuerySet:
+        return self.filter(state=PostState.PUBLISHED)
+
+    def visible_to(self, user: User) -> PostQuerySet:
+        """Published posts, plus the scheduled posts of the user."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(
+            models.Q(state=PostState.PUBLISHED) | models.Q(owner=user)
+        )
+
+    def recent(self) -> PostQuerySet:
+        """
+        Posts created within the feed window, when one is set, which lets
+        PostgreSQL skip older partitions of a partitioned table.
+        """
+        if not settings.POST_FEED_WINDOW_DAYS:
+            return self
+        # Rounded down to the hour, so the SQL of a feed, which keys its
+        # cached total, stays the same for an hour.
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        return self.filter(
+            created_at__gte=now
+            - timedelta(days=settings.POST_FEED_WINDOW_DAYS)
+        )
+
+    def due(self, now: datetime) -> PostQuerySet:
+        """Scheduled posts whose publish time has come."""
+        return self.filter(
+            state=PostState.SCHEDULED, scheduled_date__lte=now
+        )
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Hide soft-deleted posts, see `Post.all_objects`."""
+
+    def get_queryset(self) -> PostQuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 
 def create_custom_path_for_image(instance: Post, filename: str) -> str:
     _, extension = os.path.splitext(filename)
@@ -70,13 +125,68 @@ class Post(models.Model):
         db_comment="The image associated with the post",
         help_text="Upload an image to be associated with the post"
     )
-    created_date = models.DateField(
-        auto_now_add=True, db_comment="The date when the post was created"
+    image_source_url = models.URLField(
+        max_length=2000,
+        null=True,
+        blank=True,
+        db_comment="The remote URL the image of the post is fetched from",
+    )
+    image_status = models.CharField(
+        max_length=10,
+        choices=RemoteImageStatus.choices,
+        blank=True,
+        default="",
+        db_comment="The state of fetching the image from its remote URL",
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="The width of the image in pixels",
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="The height of the image in pixels",
+    )
+    image_placeholder = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        db_comment="A few pixels of the image shown while it loads",
+    )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        db_comment="The resized variants of the image",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_default=Now(),
+        db_comment="The date and time when the post was created",
     )
     scheduled_date = models.DateTimeField(
         null=True,
         blank=True,
-        db_comment="The date and time when the post is scheduled to be created"
+        db_comment="The date and time when the post is scheduled to be "
+                   "published"
+    )
+    state = models.CharField(
+        max_length=10,
+        choices=PostState.choices,
+        default=PostState.PUBLISHED,
+        db_comment="Whether the post is published or waits for its "
+                   "scheduled date",
+    )
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="When the post was deleted, its rows are purged in the "
+                   "background",
     )
     owner = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="posts"
@@ -85,9 +195,18 @@ class Post(models.Model):
     likes = models.ManyToManyField(User, related_name="posts_liked")
     comments = models.ManyToManyField(Comment, related_name="posts")
 
+    objects = PostManager()
+    all_objects = PostQuerySet.as_manager()
+
     def __str__(self):
         return f"Post: {self.title} ({self.owner})"
 
+    def is_visible_to(self, user: User) -> bool:
+        return (
+            self.state == PostState.PUBLISHED
+            or self.owner_id == getattr(user, "id", None)
+        )
+
     def clean(self):
         if self.image:
             max_image_size = 2097152
@@ -102,7 +221,12 @@ class Post(models.Model):
         super().save(*args, **kwargs)
 
     class Meta:
-        ordering = ["-created_date"]
+        ordering = ["-created_at", "id"]
         indexes = [
             models.Index(fields=["title"]),
+            models.Index(fields=["state", "scheduled_date"]),
+            # Profile pages, newest first.
+            models.Index(fields=["owner", "-created_at", "id"]),
+            # The global feed, newest first.
+            models.Index(fields=["-created_at", "id"]),
         ]
@@ -0,0 +1,257 @@
+"""
+Optional range partitioning of ``post_post`` by creation month.
+
+`convert_to_partitioned` turns the table into a table partitioned by
+``created_at`` with one partition per month, `create_partitions` adds the
+partitions of the coming months and `detach_partitions` detaches, and
+archives or drops, the partitions of old months.
+
+Posts of months without a partition, e.g. when partitions weren't created
+in time or old posts are loaded, go to the default partition. They are
+moved to the partition of their month when it's created.
+
+A unique constraint of a partitioned table must include the partition key,
+so after the conversion:
+
+* the primary key is ``(id, created_at)``, ids still come from a single
+  sequence but their uniqueness isn't enforced by the database anymore;
+* post titles are only checked for uniqueness by the serializers;
+* foreign keys to posts (likes, hashtags, comments, notifications) are
+  dropped, their cascades are done by Django as before, but rows written
+  with raw SQL aren't checked.
+"""
+import re
+from datetime import date, datetime, timezone
+
+from django.db import connection, transaction
+
+from post.models import Post
+
+POST_TABLE = Post._meta.db_table
+UNPARTITIONED_TABLE = f"{POST_TABLE}_unpartitioned"
+DEFAULT_PARTITION = f"{POST_TABLE}_default"
+ID_SEQUENCE = f"{POST_TABLE}_id_partitioned_seq"
+
+_PARTITION_NAME = re.compile(rf"^{POST_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date, months: int = 0) -> date:
+    """First day of the month of `day`, shifted by `months` months."""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{POST_TABLE}_y{month:%Y}m{month:%m}"
+
+
+def _bound(month: date) -> str:
+    return datetime(
+        month.year, month.month, 1, tzinfo=timezone.utc
+    ).isoformat()
+
+
+def is_partitioned() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s)",
+            [POST_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> list:
+    """Names and months of the partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [POST_TABLE],
+        )
+        names = [name for name, in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            year, month = map(int, match.groups())
+            partitions.append((name, date(year, month, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _create_partition(cursor, month: date) -> str:
+    # The default partition can't hold rows of a range being added, so
+    # the posts of the month are moved out of it into the new partition
+    # before it's attached.
+    name = partition_name(month)
+    lower, upper = _bound(month), _bound(month_start(month, 1))
+    with transaction.atomic():
+        cursor.execute(
+            f'CREATE TABLE "{name}" (LIKE "{POST_TABLE}" '
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [lower, upper],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{POST_TABLE}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    return name
+
+
+def _default_partition_months(cursor) -> set:
+    """Months of the posts in the default partition."""
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+        f'FROM "{DEFAULT_PARTITION}"'
+    )
+    return {month.date() for month, in cursor.fetchall()}
+
+
+def create_partitions(months_ahead: int, since: date = None) -> list:
+    """
+    Create the missing partitions from the month of `since` (the current
+    month by default) up to `months_ahead` months from now, and those of
+    the months of posts in the default partition.
+    """
+    today = datetime.now(timezone.utc).date()
+    month = month_start(since or today)
+    last = month_start(today, months_ahead)
+    existing = {name for name, _ in list_partitions()}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{DEFAULT_PARTITION}" '
+            f'PARTITION OF "{POST_TABLE}" DEFAULT'
+        )
+        months = _default_partition_months(cursor)
+        while month <= last:
+            months.add(month)
+            month = month_start(month, 1)
+        return [
+            _create_partition(cursor, month)
+            for month in sorted(months)
+            if partition_name(month) not in existing
+        ]
+
+
+def detach_partitions(
+    older_than_months: int, archive_schema: str = None, drop: bool = False
+) -> list:
+    """
+    Detach the partitions of months ending more than `older_than_months`
+    months ago, then move them to `archive_schema` or drop them.
+
+    Partitions are detached concurrently, which needs PostgreSQL 14 and
+    can't run inside a transaction.
+    """
+    cutoff = month_start(datetime.now(timezone.utc).date(), -older_than_months)
+    detached = []
+    with connection.cursor() as cursor:
+        if archive_schema:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"')
+        for name, month in list_partitions():
+            if month_start(month, 1) > cutoff:
+                break
+            cursor.execute(
+                f'ALTER TABLE "{POST_TABLE}" '
+                f'DETACH PARTITION "{name}" CONCURRENTLY'
+            )
+            if archive_schema:
+                cursor.execute(
+                    f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'
+                )
+            elif drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+            detached.append(name)
+    return detached
+
+
+def convert_to_partitioned(months_ahead: int) -> int:
+    """
+    Replace ``post_post`` by a copy partitioned by month and return the
+    number of posts copied.
+
+    The table is locked while rows are copied, so this runs in a
+    maintenance window. The original table is kept as
+    ``post_post_unpartitioned`` until it's dropped by hand.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{POST_TABLE}" IN ACCESS EXCLUSIVE MODE')
+
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = %s::regclass",
+            [POST_TABLE],
+        )
+        for table, constraint in cursor.fetchall():
+            cursor.execute(
+                f'ALTER TABLE {table} DROP CONSTRAINT "{constraint}"'
+            )
+
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid = %s::regclass",
+            [POST_TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        # Unique indexes can't be created without the partition key.
+        cursor.execute(
+            "SELECT index.relname, pg_get_indexdef(pg_index.indexrelid) "
+            "FROM pg_index "
+            "JOIN pg_class index ON index.oid = pg_index.indexrelid "
+            "WHERE pg_index.indrelid = %s::regclass "
+            "AND NOT pg_index.indisunique",
+            [POST_TABLE],
+        )
+        indexes = cursor.fetchall()
+
+        cursor.execute(
+            f'ALTER TABLE "{POST_TABLE}" RENAME TO "{UNPARTITIONED_TABLE}"'
+        )
+        for index, _ in indexes:
+            cursor.execute(
+                f'ALTER INDEX "{index}" RENAME TO "{index}_unpartitioned"'
+            )
+
+        cursor.execute(
+            f'CREATE TABLE "{POST_TABLE}" (LIKE "{UNPARTITIONED_TABLE}" '
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(
+            f'ALTER TABLE "{POST_TABLE}" ADD PRIMARY KEY (id, created_at)'
+        )
+        cursor.execute(
+            f'CREATE SEQUENCE "{ID_SEQUENCE}" OWNED BY "{POST_TABLE}".id'
+        )
+        cursor.execute(
+            f"SELECT setval(%s, COALESCE(MAX(id), 0) + 1, false) "
+            f'FROM "{UNPARTITIONED_TABLE}"',
+            [ID_SEQUENCE],
+        )
+        cursor.execute(
+            f'ALTER TABLE "{POST_TABLE}" ALTER COLUMN id '
+            f"SET DEFAULT nextval('\"{ID_SEQUENCE}\"')"
+        )
+        for constraint, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE "{POST_TABLE}" '
+                f'ADD CONSTRAINT "{constraint}" {definition}'
+            )
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+        cursor.execute(f'SELECT MIN(created_at) FROM "{UNPARTITIONED_TABLE}"')
+        oldest = cursor.fetchone()[0]
+        if oldest is not None:
+            oldest = oldest.astimezone(timezone.utc).date()
+        create_partitions(months_ahead, since=oldest)
+        cursor.execute(
+            f'INSERT INTO "{POST_TABLE}" SELECT * FROM "{UNPARTITIONED_TABLE}"'
+        )
+        return cursor.rowcount
@@ -1,17 +1,22 @@
 import os
-from urllib.request import urlopen
 
-from django.core.files.base import ContentFile
 from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 
+from media.serializers import ImageVariantsField, RemoteImageSerializerMixin
+from outbox.events import POST_PUBLISHED, POST_SCHEDULED, publish
+from post.cache import get_cached_hashtag, missing_posts
 from post.models import (
     Post,
     Hashtag,
-    Comment
+    Comment,
+    PostState,
 )
-from post.tasks import create_scheduled_post
+from purge.serializers import SoftDeletedUniqueMixin
+from users.serializers import UserDisplayNameField
 
 
 class HashtagSerializer(serializers.ModelSerializer):
@@ -20,6 +25,16 @@ class HashtagSerializer(serializers.ModelSerializer):
         fields = ["tag"]
 
 
+class HashtagPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """Validate hashtags against the two-tier cache instead of the database."""
+
+    def to_internal_value(self, data: str) -> Hashtag:
+        hashtag = get_cached_hashtag(str(data))
+        if hashtag is None:
+            self.fail("does_not_exist", pk_value=data)
+        return hashtag
+
+
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
@@ -27,7 +42,10 @@ class CommentSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data: dict, **args) -> Comment:
         pk = self.context["request"].parser_context["kwargs"]["pk"]
-        post = get_object_or_404(Post, pk=pk)
+        with missing_posts.guard(pk):
+            post = get_object_or_404(Post, pk=pk)
+        if not post.is_visible_to(self.context["request"].user):
+            raise Http404
         comment = Comment.objects.create(
             **validated_data, owner=self.context["request"].user
         )
@@ -41,7 +59,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
 
 class CommentListSerializer(serializers.ModelSerializer):
-    author = serializers.CharField(source="owner")
+    author = UserDisplayNameField("owner")
 
     class Meta:
         model = Comment
@@ -49,18 +67,23 @@ class CommentListSerializer(serializers.ModelSerializer):
             "id",
             "text",
             "author",
-            "created_date",
+            "created_at",
         ]
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(
+    SoftDeletedUniqueMixin,
+    RemoteImageSerializerMixin,
+    serializers.ModelSerializer,
+):
     """
     Serializer for the Post model.
     This serializer is used to create and update Post instances.
     It also handles the creation and updating of associated Hashtags.
+    An image can be given as a URL, it is then fetched in the background.
     """
 
-    hashtags = serializers.PrimaryKeyRelatedField(
+    hashtags = HashtagPrimaryKeyField(
         many=True,
         queryset=Hashtag.objects.all(),
         required=False,
@@ -75,13 +98,17 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = [
+            "id",
             "title",
             "text",
             "image",
+            "image_status",
             "hashtags",
             "add_new_hashtags",
-            "scheduled_date"
+            "scheduled_date",
+            "state",
         ]
+        read_only_fields = ["image_status", "state"]
 
         kwargs = {
             "image": {
@@ -93,78 +120,59 @@ class PostSerializer(serializers.ModelSerializer):
         mutable_data = data.copy()
         if "image" in mutable_data and mutable_data["image"] == "":
             mutable_data["image"] = None
-        if (
-            "image" in mutable_data
-            and isinstance(mutable_data["image"], str)
-            and mutable_data["image"].startswith("http")
-        ):
-            try:
-                response = urlopen(data["image"])
-                file_name = os.path.basename(data["image"])
-                mutable_data["image"] = ContentFile(
-                    response.read(), name=file_name
-                )
-            except Exception:
-                raise serializers.ValidationError(
-                    {"image": "Error downloading image."}
-                )
         return super().to_internal_value(mutable_data)
 
+    @staticmethod
+    def _get_or_create_hashtags(hashtags: list) -> list:
+        return [
+            Hashtag.objects.get_or_create(tag=hashtag["tag"])[0]
+            for hashtag in hashtags
+        ]
+
     def create(self, validated_data: dict) -> Post:
         user = self.context["request"].user
         add_hashtag = validated_data.pop("add_new_hashtags", [])
         hashtags = validated_data.pop("hashtags", [])
-        scheduled_date = validated_data.pop("scheduled_date", None)
-        if scheduled_date:
-            print(f"scheduled date: {scheduled_date}")
-            hashtag_tags = [hashtag.tag for hashtag in hashtags]
-            create_scheduled_post.apply_async(
-                kwargs={
-                    "title": validated_data["title"],
-                    "text": validated_data["text"],
-                    "image": validated_data["image"],
-                    "owner_id": user.id,
-                    "hashtags": hashtag_tags,
-                    "add_hashtag": add_hashtag
-                },
-                eta=scheduled_date,
-            )
-            placeholder_post = Post(
-                title=validated_data["title"],
-                text=validated_data["text"],
-                owner=user,
-                image=validated_data.get("image"),
-                scheduled_date=scheduled_date
+        scheduled_date = validated_data.get("scheduled_date")
+        if scheduled_date and scheduled_date > timezone.now():
+            # Published by post.tasks.publish_due_posts once it's due.
+            validated_data["state"] = PostState.SCHEDULED
+        with transaction.atomic():
+            post = Post.objects.create(**validated_data, owner=user)
+            hashtags += self._get_or_create_hashtags(add_hashtag)
+            if hashtags:
+                post.hashtags.add(*hashtags)
+            publish(
+                POST_SCHEDULED
+                if post.state == PostState.SCHEDULED
+                else POST_PUBLISHED,
+                post_id=post.id,
+                owner_id=user.id,
             )
-            placeholder_post.id = None
-            return placeholder_post
-        else:
-            with transaction.atomic():
-                post = Post.objects.create(**validated_data, owner=user)
-                if add_hashtag:
-                    for hashtag in add_hashtag:
-                        tag, _ = Hashtag.objects.get_or_create(
-                            tag=hashtag["tag"])
-                        post.hashtags.add(tag)
-                if hashtags:
-                    for hashtag in hashtags:
-                        post.hashtags.add(hashtag)
-                return post
+            return post
 
     def update(self, instance: Post, validated_data: dict) -> Post:
+        if instance.state == PostState.PUBLISHED:
+            # A published post can't be scheduled again.
+            validated_data.pop("scheduled_date", None)
+        elif "scheduled_date" in validated_data:
+            scheduled_date = validated_data["scheduled_date"]
+            if scheduled_date is None or scheduled_date <= timezone.now():
+                validated_data["state"] = PostState.PUBLISHED
         with transaction.atomic():
             add_hashtag = validated_data.pop("add_new_hashtags", [])
             hashtags = validated_data.pop("hashtags", [])
             instance = super().update(instance, validated_data)
-            instance.hashtags.clear()
-            if add_hashtag:
-                for hashtag in add_hashtag:
-                    tag, _ = Hashtag.objects.get_or_create(tag=hashtag["tag"])
-                    instance.hashtags.add(tag)
-            if hashtags:
-                for hashtag in hashtags:
-                    instance.hashtags.add(hashtag)
-        if validated_data["image"]:
+            if validated_data.get("state") == PostState.PUBLISHED:
+                publish(
+                    POST_PUBLISHED,
+                    post_id=instance.id,
+                    owner_id=instance.owner_id,
+                )
+            instance.hashtags.set(
+                hashtags + self._get_or_create_hashtags(add_hashtag)
+            )
+        if validated_data.get("image"):
             old_name_image = os.path.basename(instance.image.name)
             new_name_image = validated_data["image"].name
             if old_name_image == new_name_image:
@@ -173,9 +181,10 @@ class PostSerializer(serializers.ModelSerializer):
 
 
 class PostListSerializer(serializers.ModelSerializer):
-    author = serializers.CharField(source="owner")
+    author = UserDisplayNameField("owner")
     comments_count = serializers.IntegerField()
     likes_count = serializers.IntegerField()
+    image_variants = ImageVariantsField("image")
 
     class Meta:
         model = Post
@@ -183,6 +192,7 @@ class PostListSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "author",
+            "image_variants",
             "hashtags",
             "comments_count",
             "likes_count"
@@ -190,12 +200,13 @@ class PostListSerializer(serializers.ModelSerializer):
 
 
 class PostDetailSerializer(serializers.ModelSerializer):
-    author = serializers.CharField(source="owner")
+    author = UserDisplayNameField("owner")
     comments = CommentListSerializer(many=True, read_only=True)
     likes_count = serializers.IntegerField()
     who_liked = serializers.StringRelatedField(
         source="likes", many=True, read_only=True
     )
+    image_variants = ImageVariantsField("image")
 
     class Meta:
         model = Post
@@ -205,7 +216,11 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "text",
             "author",
             "image",
-            "created_date",
+            "image_status",
+            "image_variants",
+            "created_at",
+            "state",
+            "scheduled_date",
             "hashtags",
             "likes_count",
             "comments",
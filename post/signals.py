@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from media.signals import (
+    dispatch_image_variants,
+    find_replaced_image,
+    release_image_files,
+    release_replaced_image,
+    remember_image_name,
+)
+from post.cache import existing_hashtags, invalidate_posts, missing_posts
+from post.models import Comment, Hashtag, Post
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance: Post, **kwargs) -> None:
+    if kwargs.get("created"):
+        missing_posts.invalidate()
+    invalidate_posts([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def create_post_image_variants(sender, instance: Post, **kwargs) -> None:
+    dispatch_image_variants(instance, "image")
+
+
+@receiver(post_init, sender=Post)
+def remember_post_image(sender, instance: Post, **kwargs) -> None:
+    remember_image_name(instance, "image")
+
+
+@receiver(pre_save, sender=Post)
+def find_replaced_post_image(sender, instance: Post, **kwargs) -> None:
+    find_replaced_image(instance, "image", kwargs.get("update_fields"))
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_post_image(sender, instance: Post, **kwargs) -> None:
+    release_replaced_image(instance, "image")
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance: Post, **kwargs) -> None:
+    release_image_files(instance, "image")
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_deleted_post(sender, instance: Post, **kwargs) -> None:
+    # Through rows are deleted without m2m_changed, so collect the
+    # hashtags while they still exist.
+    invalidate_posts([instance.pk])
+
+
+@receiver(m2m_changed, sender=Post.hashtags.through)
+def invalidate_post_hashtags(
+    sender, instance, action: str, reverse: bool, pk_set: set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        post_ids = pk_set or instance.posts.values_list("id", flat=True)
+        invalidate_posts(post_ids, tags=[instance.pk])
+    else:
+        invalidate_posts([instance.pk], tags=pk_set or ())
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+@receiver(m2m_changed, sender=Post.comments.through)
+def invalidate_post_relations(
+    sender, instance, action: str, reverse: bool, pk_set: set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_posts([instance.pk])
+    elif pk_set:
+        invalidate_posts(pk_set)
+    elif action == "pre_clear":
+        related_name = (
+            "posts_liked" if sender is Post.likes.through else "posts"
+        )
+        invalidate_posts(
+            getattr(instance, related_name).values_list("id", flat=True)
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(pre_delete, sender=Comment)
+def invalidate_comment_posts(sender, instance: Comment, **kwargs) -> None:
+    invalidate_posts(instance.posts.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Hashtag)
+def invalidate_hashtag_posts(sender, instance: Hashtag, **kwargs) -> None:
+    invalidate_posts(
+        instance.posts.values_list("id", flat=True), tags=[instance.pk]
+    )
+
+
+@receiver(post_save, sender=Hashtag)
+@receiver(post_delete, sender=Hashtag)
+def invalidate_hashtag_exists(sender, instance: Hashtag, **kwargs) -> None:
+    transaction.on_commit(lambda: existing_hashtags.delete(instance.pk))
@@ -1,10 +1,15 @@
 import logging
 
 from celery import shared_task
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.utils import timezone
 
-from post.models import Post, Hashtag
+from outbox.events import POST_PUBLISHED, publish_many
+from post.cache import invalidate_posts
+from post.models import Post, Hashtag, PostState
+from post.partitioning import create_partitions, is_partitioned
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,11 @@ def create_scheduled_post(
     hashtags: list,
     add_hashtag: list,
 ) -> None:
+    """
+    Create a post scheduled with an ETA. Scheduled posts are now stored
+    right away and published by `publish_due_posts`, this task only drains
+    messages queued before that.
+    """
     try:
         with transaction.atomic():
             logger.info(
@@ -38,3 +48,54 @@ def create_scheduled_post(
     except Exception as e:
         logger.error("Error creating post: %s", str(e))
         raise
+
+
+@shared_task
+def publish_due_posts() -> int:
+    """
+    Publish every scheduled post whose time has come, in batches.
+
+    Due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+    overlapping runs on several workers publish disjoint batches.
+    """
+    batch_size = settings.SCHEDULED_POSTS_BATCH_SIZE
+    published = 0
+    while True:
+        with transaction.atomic():
+            due_posts = list(
+                Post.objects.due(timezone.now())
+                .select_for_update(skip_locked=True)
+                .order_by("scheduled_date")
+                .values_list("id", "owner_id")[:batch_size]
+            )
+            if not due_posts:
+                break
+            post_ids = [post_id for post_id, _ in due_posts]
+            Post.objects.filter(id__in=post_ids).update(
+                state=PostState.PUBLISHED, created_at=timezone.now()
+            )
+            invalidate_posts(post_ids)
+            publish_many(
+                POST_PUBLISHED,
+                [
+                    {"post_id": post_id, "owner_id": owner_id}
+                    for post_id, owner_id in due_posts
+                ],
+            )
+        published += len(post_ids)
+        if len(post_ids) < batch_size:
+            break
+    if published:
+        logger.info("Published %s scheduled posts", published)
+    return published
+
+
+@shared_task
+def create_post_partitions() -> list:
+    """Create the partitions of the coming months, if posts are partitioned."""
+    if not is_partitioned():
+        return []
+    created = create_partitions(settings.POST_PARTITION_MONTHS_AHEAD)
+    if created:
+        logger.info("Created post partitions %s", ", ".join(created))
+    return created
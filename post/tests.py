@@ -1,3 +1,233 @@
-from django.test import TestCase
+from datetime import datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.response import Response
+
+from post.models import Comment, Hashtag, Post
+from post.views import PostViewSet
+from social_media_api.testing import (
+    QueryBudgetTestCase,
+    create_posts,
+    create_user,
+    sequence,
+)
+
+
+def post_url(post: Post, name: str = "post-detail") -> str:
+    return reverse(f"post:{name}", args=[post.id])
+
+
+class PostViewSetQueryBudgetTests(QueryBudgetTestCase):
+    view_class = PostViewSet
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = create_user()
+        self.author = create_user()
+        self.posts = create_posts(self.user) + create_posts(self.author)
+        self.authenticate(self.user)
+
+    def seed(self) -> None:
+        create_posts(self.author, 5)
+
+    def test_list(self) -> None:
+        self.assertQueryBudget(
+            "list",
+            lambda: self.client.get(reverse("post:post-list")),
+            self.seed,
+        )
+
+    def test_list_anonymous(self) -> None:
+        self.client.credentials()
+        self.assertQueryBudget(
+            "list",
+            lambda: self.client.get(
+                reverse("post:post-list"), {"hashtag": "common"}
+            ),
+            self.seed,
+        )
+
+    def test_retrieve(self) -> None:
+        post = self.posts[0]
+
+        def seed() -> None:
+            for _ in range(5):
+                user = create_user()
+                post.comments.add(
+                    Comment.objects.create(text="Comment", owner=user)
+                )
+                post.likes.add(user)
+
+        self.assertQueryBudget(
+            "retrieve", lambda: self.client.get(post_url(post)), seed
+        )
+
+    def test_create(self) -> None:
+        Hashtag.objects.create(tag="existing")
+
+        def request() -> Response:
+            index = next(sequence)
+            return self.client.post(
+                reverse("post:post-list"),
+                {
+                    "title": f"New post {index}",
+                    "text": "Text",
+                    "hashtags": ["existing"],
+                    "add_new_hashtags": [{"tag": f"new{index}"}],
+                },
+                format="json",
+            )
+
+        self.assertQueryBudget("create", request, self.seed)
+
+    def test_update(self) -> None:
+        Hashtag.objects.create(tag="existing")
+        for action, method in (
+            ("update", self.client.put),
+            ("partial_update", self.client.patch),
+        ):
+
+            def request() -> Response:
+                index = next(sequence)
+                return method(
+                    post_url(self.posts[0]),
+                    {
+                        "title": f"Updated post {index}",
+                        "text": "Text",
+                        "hashtags": ["existing"],
+                        "add_new_hashtags": [{"tag": f"new{index}"}],
+                    },
+                    format="json",
+                )
+
+            self.assertQueryBudget(action, request, self.seed)
+
+    def test_destroy(self) -> None:
+        posts = iter(self.posts[:2])
+        self.assertQueryBudget(
+            "destroy",
+            lambda: self.client.delete(post_url(next(posts))),
+            self.seed,
+        )
+
+    def test_add_comment(self) -> None:
+        self.assertQueryBudget(
+            "add_comment",
+            lambda: self.client.post(
+                post_url(self.posts[3], "post-add-comment"),
+                {"text": "Comment"},
+                format="json",
+            ),
+            self.seed,
+        )
+
+    def test_edit_comment(self) -> None:
+        comment = Comment.objects.create(text="Comment", owner=self.user)
+        self.posts[3].comments.add(comment)
+        self.assertQueryBudget(
+            "edit_comment",
+            lambda: self.client.put(
+                reverse(
+                    "post:post-edit-comment",
+                    args=[self.posts[3].id, comment.id],
+                ),
+                {"text": "Edited"},
+                format="json",
+            ),
+            self.seed,
+        )
+
+    def test_like_and_unlike(self) -> None:
+        def seed() -> None:
+            for post in self.posts[3:]:
+                post.likes.add(*(create_user() for _ in range(5)))
+
+        for action in ("like", "unlike"):
+            posts = iter(self.posts[3:5])
+            self.assertQueryBudget(
+                action,
+                lambda: self.client.get(
+                    post_url(next(posts), f"post-{action}")
+                ),
+                seed,
+            )
+
+
+class PostSoftDeleteTests(QueryBudgetTestCase):
+    view_class = PostViewSet
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.user = create_user()
+        self.authenticate(self.user)
+
+    def test_title_of_deleted_post_stays_taken(self) -> None:
+        post = Post.objects.create(title="Same", text="Text", owner=self.user)
+        self.assertEqual(self.client.delete(post_url(post)).status_code, 204)
+
+        response = self.client.post(
+            reverse("post:post-list"),
+            {"title": "Same", "text": "Text"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("title", response.data)
+
+    def test_posts_of_deleted_user_leave_cached_responses(self) -> None:
+        post = create_posts(self.user, 1)[0]
+        self.client.credentials()
+        self.assertEqual(self.client.get(post_url(post)).status_code, 200)
+        self.authenticate(create_user(is_staff=True))
+        # The purge is left out, the posts are only hidden.
+        with mock.patch("purge.deletion.purge_batch"):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(
+                    reverse("users:user-detail", args=[self.user.id])
+                )
+        self.assertEqual(response.status_code, 204)
+        self.client.credentials()
+
+        self.assertEqual(self.client.get(post_url(post)).status_code, 404)
+
+
+class PostListPaginationTests(QueryBudgetTestCase):
+    view_class = PostViewSet
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.author = create_user(username=f"author{next(sequence)}")
+        create_posts(self.author, 2)
+        self.authenticate(self.author)
+
+    def test_rows_past_a_cached_total_are_reachable(self) -> None:
+        url = f"{reverse('post:post-list')}?author={self.author.username}"
+        first = self.client.get(f"{url}&limit=2")
+        self.assertEqual(first.data["count"], 2)
+        self.assertIsNone(first.data["next"])
+
+        create_posts(self.author, 2)
+        second = self.client.get(f"{url}&limit=2")
+
+        self.assertEqual(second.data["count"], 2)
+        self.assertIsNotNone(second.data["next"])
+        last = self.client.get(second.data["next"])
+        self.assertEqual(len(last.data["results"]), 2)
+        self.assertIsNone(last.data["next"])
+
+
+@override_settings(POST_FEED_WINDOW_DAYS=7)
+class RecentPostsTests(SimpleTestCase):
+    def sql_at(self, now: datetime) -> tuple:
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            return Post.objects.recent().query.sql_with_params()
+
+    def test_window_changes_once_an_hour(self) -> None:
+        at = datetime(2026, 10, 19, 12, 5, tzinfo=timezone.utc)
+        self.assertEqual(self.sql_at(at), self.sql_at(at.replace(minute=55)))
+        self.assertNotEqual(self.sql_at(at), self.sql_at(at.replace(hour=13)))
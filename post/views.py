@@ -1,5 +1,6 @@
+from django.db import transaction
 from django.db.models import Count
-from django.http import HttpRequest, HttpResponse
+from django.http import Http404, HttpRequest, HttpResponse
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiResponse,
@@ -11,6 +12,8 @@ from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from outbox.events import POST_LIKED, POST_UNLIKED, publish
+from post.cache import PostResponseCacheMixin, missing_posts
 from post.models import Post
 from post.permissions import IsOwnerOrReadOnly
 from post.serializers import (
@@ -19,6 +22,9 @@ from post.serializers import (
     PostDetailSerializer,
     CommentSerializer,
 )
+from purge.deletion import soft_delete
+from social_media_api.db_router import writes_on_safe_request
+from social_media_api.query_budget import QueryBudgetMixin
 
 
 @extend_schema_view(
@@ -75,7 +81,9 @@ from post.serializers import (
     ),
     destroy=extend_schema(
         summary="Delete a post",
-        description="Delete a post by ID.",
+        description="Delete a post by ID. The post is hidden at once, its "
+                    "comments, likes and notifications are deleted in the "
+                    "background.",
         tags=["Posts"],
         responses={204: OpenApiResponse(description="No Content")},
     ),
@@ -104,11 +112,27 @@ from post.serializers import (
         responses={200: OpenApiResponse(description="Unliked the post")},
     ),
 )
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    QueryBudgetMixin, PostResponseCacheMixin, viewsets.ModelViewSet
+):
     queryset = (
         Post.objects.all().select_related("owner").prefetch_related("hashtags")
     )
     serializer_class = PostSerializer
+    action_throttle_scopes = {"like": "interactions", "unlike": "interactions"}
+    cached_count_filters = ("hashtag", "author")
+    query_budgets = {
+        "list": 5,
+        "retrieve": 6,
+        "create": 17,
+        "update": 21,
+        "partial_update": 21,
+        "destroy": 8,
+        "add_comment": 7,
+        "edit_comment": 8,
+        "like": 10,
+        "unlike": 9,
+    }
 
     def get_permissions(self):
         if self.action in ("add_comment", "edit_comment", "like", "unlike"):
@@ -128,6 +152,20 @@ class PostViewSet(viewsets.ModelViewSet):
             return CommentSerializer
         return super().get_serializer_class()
 
+    def get_object(self) -> Post:
+        with missing_posts.guard(
+            self.kwargs[self.lookup_field],
+            remember=not self.request.query_params,
+        ):
+            post = super().get_object()
+        # Checked outside of the guard, a scheduled post isn't missing.
+        if not post.is_visible_to(self.request.user):
+            raise Http404
+        return post
+
+    def perform_destroy(self, instance: Post) -> None:
+        soft_delete(instance)
+
     @staticmethod
     def _get_params_hashtag(qr_params: str) -> list:
         return [hashtag.lower() for hashtag in qr_params.split(",")]
@@ -146,8 +184,13 @@ class PostViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(owner__username=author)
 
         if self.action == "list":
-            queryset = queryset.annotate(
-                comments_count=Count("comments"), likes_count=Count("likes")
+            queryset = (
+                queryset.visible_to(self.request.user)
+                .recent()
+                .annotate(
+                    comments_count=Count("comments"),
+                    likes_count=Count("likes"),
+                )
             )
 
         if title:
@@ -214,13 +257,21 @@ class PostViewSet(viewsets.ModelViewSet):
     )
     def like(self, request: HttpRequest, pk: int = None) -> HttpResponse:
         user = self.request.user
+        writes_on_safe_request(request)
         post = self.get_object()
-        if user in post.likes.all():
+        if post.likes.filter(pk=user.pk).exists():
             return Response(
                 data={"message": "You already liked this post"},
                 status=status.HTTP_200_OK,
             )
-        post.likes.add(user)
+        with transaction.atomic():
+            post.likes.add(user)
+            publish(
+                POST_LIKED,
+                post_id=post.id,
+                owner_id=post.owner_id,
+                user_id=user.id,
+            )
         return Response(
             data={
                 "message": f"You liked this post '{post.title}' (id={post.id})"
@@ -237,13 +288,21 @@ class PostViewSet(viewsets.ModelViewSet):
     )
     def unlike(self, request: HttpRequest, pk: int = None) -> HttpResponse:
         user = self.request.user
+        writes_on_safe_request(request)
         post = self.get_object()
-        if user not in post.likes.all():
+        if not post.likes.filter(pk=user.pk).exists():
             return Response(
                 data={"message": "You didn't like this post"},
                 status=status.HTTP_200_OK,
             )
-        post.likes.remove(user)
+        with transaction.atomic():
+            post.likes.remove(user)
+            publish(
+                POST_UNLIKED,
+                post_id=post.id,
+                owner_id=post.owner_id,
+                user_id=user.id,
+            )
         return Response(
             data={
                 "message": f"You unliked this post '{post.title}' "
@@ -0,0 +1,65 @@
+"""
+Soft deletion of users and posts.
+
+Deleting a user or a post with Django's collector loads and deletes every
+dependent row in the request's transaction. Instead, `soft_delete` only
+marks the object deleted, which hides it at once, and queues a `PurgeJob`
+that deletes the rest in bounded batches (see `purge.tasks.purge_batch`).
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.utils import timezone
+
+from post.cache import POST_OWNERS_GENERATION, invalidate_posts
+from post.models import Post
+from purge.models import PurgeJob, PurgeTarget
+from purge.tasks import purge_batch
+from social_media_api.cache import bump_generations
+from users.authentication import drop_cached_user
+from users.cache import profile_generation, user_display_names
+from users.models import User
+
+
+def _hide_user(user: User, now) -> None:
+    # Saved with update() as `User.save()` validates the whole row.
+    User.all_objects.filter(pk=user.pk).update(
+        deleted_at=now, is_active=False
+    )
+    user.deleted_at = now
+    user.is_active = False
+    Post.objects.filter(owner_id=user.pk).update(deleted_at=now)
+
+    def invalidate() -> None:
+        drop_cached_user(user.pk)
+        user_display_names.delete(user.pk)
+        # One generation for all the posts, the user may have many.
+        bump_generations(
+            profile_generation(user.pk), POST_OWNERS_GENERATION
+        )
+
+    transaction.on_commit(invalidate)
+
+
+def _hide_post(post: Post, now) -> None:
+    Post.all_objects.filter(pk=post.pk).update(deleted_at=now)
+    post.deleted_at = now
+    invalidate_posts([post.pk])
+
+
+def soft_delete(instance: User | Post) -> PurgeJob:
+    """
+    Hide a user, with their posts, or a post and queue the purge of its
+    rows once the transaction commits.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if isinstance(instance, User):
+            target = PurgeTarget.USER
+            _hide_user(instance, now)
+        else:
+            target = PurgeTarget.POST
+            _hide_post(instance, now)
+        job = PurgeJob.objects.create(target=target, object_id=instance.pk)
+        transaction.on_commit(lambda: purge_batch.delay(job.id))
+    return job
@@ -0,0 +1,89 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PurgeJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("user", "User"), ("post", "Post")],
+                        db_comment="Kind of object purged",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(db_comment="Id of the object purged"),
+                ),
+                (
+                    "step",
+                    models.CharField(
+                        blank=True,
+                        db_comment="Name of the step being purged",
+                        default="",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "deleted",
+                    models.PositiveIntegerField(
+                        db_comment="Number of rows deleted so far", default=0
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_comment="When the object was soft-deleted"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_comment="When the last batch was deleted"
+                    ),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        db_comment="When the object itself was deleted",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("completed_at__isnull", True)),
+                        fields=["updated_at"],
+                        name="purge_pending_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="purgejob",
+            constraint=models.UniqueConstraint(
+                fields=("target", "object_id"), name="unique_purge_job"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import models
+
+
+class PurgeTarget(models.TextChoices):
+    USER = "user", "User"
+    POST = "post", "Post"
+
+
+class PurgeJob(models.Model):
+    """
+    Progress of deleting a soft-deleted user or post with everything that
+    depends on it, so a failed batch resumes where the last one stopped.
+    """
+
+    target = models.CharField(
+        max_length=10,
+        choices=PurgeTarget.choices,
+        db_comment="Kind of object purged",
+    )
+    object_id = models.BigIntegerField(db_comment="Id of the object purged")
+    step = models.CharField(
+        max_length=50,
+        blank=True,
+        default="",
+        db_comment="Name of the step being purged",
+    )
+    deleted = models.PositiveIntegerField(
+        default=0, db_comment="Number of rows deleted so far"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_comment="When the object was soft-deleted"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, db_comment="When the last batch was deleted"
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_comment="When the object itself was deleted",
+    )
+
+    def __str__(self):
+        return f"Purge of {self.target} {self.object_id} ({self.deleted})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target", "object_id"], name="unique_purge_job"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(completed_at__isnull=True),
+                name="purge_pending_idx",
+            ),
+        ]
@@ -0,0 +1,53 @@
+from django.db import models
+from rest_framework.utils.field_mapping import get_unique_error_message
+from rest_framework.validators import UniqueValidator
+
+
+class SoftDeletedUniqueMixin:
+    """
+    Check the unique fields of a model serializer against soft-deleted rows
+    too.
+
+    DRF builds its `UniqueValidator`s on the default manager, which hides
+    soft-deleted rows although they keep their unique values until they
+    are purged, so a taken value would only fail at the database with an
+    `IntegrityError`. The validators are built on `all_objects` instead.
+    """
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(
+            field_name, model_field
+        )
+        validators = field_kwargs.get("validators")
+        if validators and any(
+            isinstance(validator, UniqueValidator) for validator in validators
+        ):
+            field_kwargs["validators"] = [
+                validator
+                for validator in validators
+                if not isinstance(validator, UniqueValidator)
+            ] + self._get_unique_validators(field_name, model_field)
+        return field_class, field_kwargs
+
+    @staticmethod
+    def _get_unique_validators(field_name, model_field) -> list:
+        model = model_field.model
+        conditions = {
+            constraint.condition
+            for constraint in model._meta.constraints
+            if isinstance(constraint, models.UniqueConstraint)
+            and set(constraint.fields) == {field_name}
+        }
+        if model_field.unique:
+            conditions.add(None)
+        queryset = model.all_objects.all()
+        return [
+            UniqueValidator(
+                queryset=(
+                    queryset if condition is None
+                    else queryset.filter(condition)
+                ),
+                message=get_unique_error_message(model_field),
+            )
+            for condition in conditions
+        ]
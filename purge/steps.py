@@ -0,0 +1,112 @@
+"""
+What is deleted when a soft-deleted user or post is purged, in order.
+
+Every step is a queryset of rows depending on the object, deleted a batch
+at a time, and the object itself is the last step. Rows are deleted
+before what they point to, so Django's collector never has more than a
+batch to cascade to.
+"""
+from __future__ import annotations
+
+from typing import Callable, NamedTuple
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+from notifications.models import Notification
+from post.cache import invalidate_posts
+from post.models import Comment, Post
+from purge.models import PurgeJob, PurgeTarget
+from social_media_api.cache import bump_generations
+from users.cache import profile_generation, subscriptions_generation
+from users.models import User
+
+
+class PurgeStep(NamedTuple):
+    name: str
+    queryset: QuerySet
+    # Called with the rows of a batch before they are deleted, for rows
+    # deleted without signals.
+    before_delete: Callable[[QuerySet], None] | None = None
+
+    def delete_batch(self, batch_size: int) -> int:
+        """Delete the next batch and return the number of rows deleted."""
+        ids = list(
+            self.queryset.order_by()
+            .values_list("pk", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not ids:
+            return 0
+        batch = self.queryset.model._base_manager.filter(pk__in=ids)
+        if self.before_delete is not None:
+            self.before_delete(batch)
+        deleted, _ = batch.delete()
+        return deleted
+
+
+def _invalidate_liked_posts(likes: QuerySet) -> None:
+    invalidate_posts(likes.values_list("post_id", flat=True))
+
+
+def _invalidate_follow_edges(edges: QuerySet) -> None:
+    user_ids = set()
+    for edge in edges.values_list("from_user_id", "to_user_id"):
+        user_ids.update(edge)
+    names = [profile_generation(pk) for pk in user_ids]
+    names += [subscriptions_generation(pk) for pk in user_ids]
+    transaction.on_commit(lambda: bump_generations(*names))
+
+
+def _post_steps(posts: QuerySet) -> list[PurgeStep]:
+    post_ids = posts.values("id")
+    return [
+        PurgeStep(
+            "post_notifications",
+            Notification.objects.filter(post__in=post_ids),
+        ),
+        PurgeStep(
+            "post_likes", Post.likes.through.objects.filter(post__in=post_ids)
+        ),
+        PurgeStep(
+            "post_hashtags",
+            Post.hashtags.through.objects.filter(post__in=post_ids),
+        ),
+        PurgeStep("post_comments", Comment.objects.filter(posts__in=post_ids)),
+        PurgeStep("posts", posts),
+    ]
+
+
+def _user_steps(user_id: int) -> list[PurgeStep]:
+    edges = Q(from_user_id=user_id) | Q(to_user_id=user_id)
+    return [
+        # What the user left on other users' posts goes first.
+        PurgeStep("comments", Comment.objects.filter(owner_id=user_id)),
+        PurgeStep(
+            "likes",
+            Post.likes.through.objects.filter(user_id=user_id),
+            _invalidate_liked_posts,
+        ),
+        *_post_steps(Post.all_objects.filter(owner_id=user_id)),
+        PurgeStep(
+            "followers",
+            User.followers.through.objects.filter(edges),
+            _invalidate_follow_edges,
+        ),
+        PurgeStep(
+            "subscriptions",
+            User.my_subscriptions.through.objects.filter(edges),
+            _invalidate_follow_edges,
+        ),
+        PurgeStep(
+            "notifications",
+            Notification.objects.filter(recipient_id=user_id),
+        ),
+        PurgeStep("user", User.all_objects.filter(id=user_id)),
+    ]
+
+
+def purge_steps(job: PurgeJob) -> list[PurgeStep]:
+    if job.target == PurgeTarget.USER:
+        return _user_steps(job.object_id)
+    return _post_steps(Post.all_objects.filter(id=job.object_id))
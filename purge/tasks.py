@@ -0,0 +1,70 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from purge.models import PurgeJob
+from purge.steps import purge_steps
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_batch(job_id: int) -> None:
+    """
+    Delete the next batch of rows of a purge job, then queue the following
+    batch.
+
+    Every batch is deleted in one transaction with the job's checkpoint,
+    so a retried or redelivered batch resumes at the step it stopped at.
+    """
+    batch_size = settings.PURGE_BATCH_SIZE
+    with transaction.atomic():
+        job = (
+            PurgeJob.objects.select_for_update()
+            .filter(id=job_id, completed_at__isnull=True)
+            .first()
+        )
+        if job is None:
+            return
+        steps = purge_steps(job)
+        names = [step.name for step in steps]
+        start = names.index(job.step) if job.step in names else 0
+        for step in steps[start:]:
+            job.step = step.name
+            deleted = step.delete_batch(batch_size)
+            if deleted:
+                job.deleted += deleted
+                break
+        else:
+            job.completed_at = timezone.now()
+        job.save()
+
+    if job.completed_at is None:
+        purge_batch.delay(job_id)
+    else:
+        logger.info(
+            "Purged %s %s, %s rows deleted",
+            job.target,
+            job.object_id,
+            job.deleted,
+        )
+
+
+@shared_task
+def resume_purge_jobs() -> int:
+    """Queue again the purge jobs whose next batch seems lost."""
+    stalled_before = timezone.now() - timedelta(
+        seconds=settings.PURGE_RESUME_AFTER
+    )
+    job_ids = list(
+        PurgeJob.objects.filter(
+            completed_at__isnull=True, updated_at__lt=stalled_before
+        ).values_list("id", flat=True)
+    )
+    for job_id in job_ids:
+        purge_batch.delay(job_id)
+    return len(job_ids)
@@ -0,0 +1,182 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationVerb
+from post.models import Comment, Post
+from purge.deletion import soft_delete
+from purge.models import PurgeJob
+from purge.steps import purge_steps
+from purge.tasks import purge_batch, resume_purge_jobs
+from social_media_api.testing import create_posts, create_user
+from users.models import User
+
+
+def follow(follower: User, user: User) -> None:
+    follower.my_subscriptions.add(user)
+    user.followers.add(follower)
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PURGE_BATCH_SIZE=2,
+)
+class UserPurgeTests(TestCase):
+    def setUp(self) -> None:
+        self.user = create_user()
+        self.other = create_user()
+        self.third = create_user()
+
+        self.posts = create_posts(self.user, 2)
+        self.other_post = create_posts(self.other, 1)[0]
+        self.other_post.comments.add(
+            Comment.objects.create(text="Comment", owner=self.user)
+        )
+        self.other_post.likes.add(self.user, self.third)
+        follow(self.user, self.other)
+        follow(self.other, self.user)
+        follow(self.third, self.other)
+        Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                post=self.other_post,
+                verb=NotificationVerb.POST_PUBLISHED,
+            ),
+            Notification(
+                recipient=self.other,
+                post=self.posts[0],
+                verb=NotificationVerb.POST_PUBLISHED,
+            ),
+            Notification(
+                recipient=self.third,
+                post=self.other_post,
+                verb=NotificationVerb.POST_PUBLISHED,
+            ),
+        ])
+
+        self.post_comment_ids = list(
+            Comment.objects.filter(posts__in=self.posts).values_list(
+                "id", flat=True
+            )
+        )
+        self.other_rows = {
+            "comments": set(
+                Comment.objects.exclude(owner=self.user).exclude(
+                    id__in=self.post_comment_ids
+                ).values_list("id", flat=True)
+            ),
+            "likes": set(
+                Post.likes.through.objects.exclude(user=self.user)
+                .exclude(post__in=self.posts)
+                .values_list("id", flat=True)
+            ),
+        }
+
+    def run_purge(self, job: PurgeJob) -> int:
+        """Run the batches of `job` until it completes, return their number."""
+        batches = 0
+        with mock.patch.object(purge_batch, "delay") as delay:
+            while True:
+                purge_batch(job.id)
+                batches += 1
+                if not delay.called:
+                    break
+                delay.reset_mock()
+        job.refresh_from_db()
+        return batches
+
+    def test_purge_user(self) -> None:
+        job = soft_delete(self.user)
+
+        batches = self.run_purge(job)
+
+        self.assertIsNotNone(job.completed_at)
+        self.assertGreater(batches, len(purge_steps(job)))
+        self.assertFalse(User.all_objects.filter(id=self.user.id).exists())
+        self.assertFalse(
+            Post.all_objects.filter(id__in=[p.id for p in self.posts]).exists()
+        )
+        self.assertFalse(Comment.objects.filter(owner=self.user).exists())
+        self.assertFalse(
+            Comment.objects.filter(id__in=self.post_comment_ids).exists()
+        )
+        self.assertFalse(
+            Post.likes.through.objects.filter(user=self.user).exists()
+        )
+        self.assertFalse(
+            Notification.objects.filter(recipient=self.user).exists()
+        )
+        self.assertFalse(
+            Notification.objects.filter(post__in=self.posts).exists()
+        )
+        for through in (User.followers.through, User.my_subscriptions.through):
+            self.assertFalse(
+                through.objects.filter(from_user=self.user).exists()
+            )
+            self.assertFalse(
+                through.objects.filter(to_user=self.user).exists()
+            )
+
+    def test_rows_of_other_users_survive(self) -> None:
+        self.run_purge(soft_delete(self.user))
+
+        self.assertTrue(Post.objects.filter(id=self.other_post.id).exists())
+        self.assertEqual(
+            set(Comment.objects.values_list("id", flat=True)),
+            self.other_rows["comments"],
+        )
+        self.assertEqual(
+            set(Post.likes.through.objects.values_list("id", flat=True)),
+            self.other_rows["likes"],
+        )
+        self.assertEqual(list(self.other.followers.all()), [self.third])
+        self.assertTrue(
+            Notification.objects.filter(recipient=self.third).exists()
+        )
+        self.assertEqual(User.objects.count(), User.all_objects.count())
+        self.assertTrue(User.objects.filter(id=self.third.id).exists())
+
+    def test_resume_from_stored_step(self) -> None:
+        job = soft_delete(self.user)
+        PurgeJob.objects.filter(id=job.id).update(step="followers")
+
+        with mock.patch.object(purge_batch, "delay"):
+            purge_batch(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.step, "followers")
+        self.assertEqual(job.deleted, 2)
+        # Earlier steps aren't run again.
+        self.assertTrue(Comment.objects.filter(owner=self.user).exists())
+        self.assertTrue(Post.all_objects.filter(owner=self.user).exists())
+
+        self.run_purge(job)
+        self.assertIsNotNone(job.completed_at)
+        self.assertFalse(User.all_objects.filter(id=self.user.id).exists())
+
+    def test_completed_job_is_not_run_again(self) -> None:
+        job = soft_delete(self.user)
+        self.run_purge(job)
+        deleted = job.deleted
+
+        self.assertEqual(self.run_purge(job), 1)
+        self.assertEqual(job.deleted, deleted)
+
+    def test_resume_stalled_jobs(self) -> None:
+        stalled = soft_delete(self.user)
+        soft_delete(self.other)
+        PurgeJob.objects.filter(id=stalled.id).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        with mock.patch.object(purge_batch, "delay") as delay:
+            self.assertEqual(resume_purge_jobs(), 1)
+
+        delay.assert_called_once_with(stalled.id)
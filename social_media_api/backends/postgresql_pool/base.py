@@ -0,0 +1,123 @@
+"""
+PostgreSQL backend taking connections from a psycopg_pool ConnectionPool.
+
+Django 5.0 has no pooling of its own. Configure the pool with the "pool"
+dict of OPTIONS (min_size, max_size, timeout) and keep CONN_MAX_AGE at 0,
+so every request hands its connection back to the pool when it ends.
+
+Pools are closed when the process exits, and before the test runner drops
+or clones a test database, which PostgreSQL refuses while connections to
+it are open.
+"""
+import atexit
+import os
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from django.utils.asyncio import async_unsafe
+from psycopg import IsolationLevel
+from psycopg_pool import ConnectionPool
+
+# The pool of each database alias in this process, with the connection
+# parameters it was opened with. A pool is replaced when they change, e.g.
+# when the test runner switches NAME to the test database, and after a
+# fork, as its worker threads don't survive it.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def close_pools(dbname: str | None = None) -> None:
+    """Close the pools of this process, or those connected to `dbname`."""
+    with _pools_lock:
+        for alias, (pid, params, pool) in list(_pools.items()):
+            if pid != os.getpid():
+                continue
+            if dbname is None or params.get("dbname") == dbname:
+                del _pools[alias]
+                pool.close()
+
+
+atexit.register(close_pools)
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity) -> None:
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False) -> None:
+        close_pools(self.connection.settings_dict["NAME"])
+        super()._clone_test_db(suffix, verbosity, keepdb)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    @property
+    def pool_options(self) -> dict:
+        return self.settings_dict["OPTIONS"].get("pool", {})
+
+    @property
+    def pool(self) -> ConnectionPool:
+        params = self.get_connection_params()
+        with _pools_lock:
+            pid, pool_params, pool = _pools.get(
+                self.alias, (None, None, None)
+            )
+            if pid == os.getpid() and pool_params != params:
+                # Connections still in use are closed when given back.
+                pool.close()
+                pid = None
+            if pid != os.getpid():
+                pool = ConnectionPool(
+                    kwargs=params,
+                    min_size=self.pool_options.get("min_size", 2),
+                    max_size=self.pool_options.get("max_size", 10),
+                    timeout=self.pool_options.get("timeout", 10),
+                    name=self.alias,
+                    check=ConnectionPool.check_connection,
+                    open=True,
+                )
+                _pools[self.alias] = (os.getpid(), params, pool)
+        return pool
+
+    @property
+    def is_pooled(self) -> bool:
+        # Connections to the "postgres" database, used to create and drop
+        # test databases, are short-lived and not worth a pool.
+        return self.alias != NO_DB_ALIAS
+
+    def get_connection_params(self) -> dict:
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params: dict):
+        if not self.is_pooled:
+            return super().get_new_connection(conn_params)
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        # Kept to give the connection back to the pool it came from, even
+        # once the pool has been replaced.
+        self._connection_pool = self.pool
+        connection = self._connection_pool.getconn()
+        connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is None:
+            return
+        if not self.is_pooled:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool rolls back anything left open and discards broken
+            # connections.
+            self._connection_pool.putconn(self.connection)
+
+    def pool_stats(self) -> dict:
+        return self.pool.get_stats()
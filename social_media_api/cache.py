@@ -0,0 +1,411 @@
+"""
+Helpers shared by the Redis-backed caches of the project.
+
+Cached values are never deleted one by one. Instead, every cache key embeds
+the current "generation" of the data it depends on, and writers bump the
+generation so old entries are simply never read again and expire by TTL.
+
+Expensive values are recomputed by a single worker at a time (see
+``get_or_compute``), while the others keep serving the previous value.
+
+Lookups of primary keys that don't exist are remembered for a short time
+(see ``MissingObjectCache``), so repeated 404s don't reach the database.
+
+Very hot and small values are additionally kept in a bounded per-process
+LRU (see ``TwoTierCache``). Invalidations of those are broadcast over Redis
+pub/sub, so every gunicorn and Celery process drops stale copies.
+"""
+import functools
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+
+from social_media_api.db_router import read_from_primary, reading_from_replica
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY_PREFIX = "generation"
+INVALIDATION_CHANNEL = "social_media_api:invalidate"
+STATS_KEY_PREFIX = "social_media_api:cache-stats"
+LOCK_KEY_PREFIX = "social_media_api:recompute-lock"
+UNCACHED_KEY_PREFIX = "social_media_api:uncached"
+
+_MISSING = object()
+
+
+@functools.cache
+def get_redis() -> redis.Redis:
+    """Return a client for the Redis instance used as the shared cache."""
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def _generation_key(name: str) -> str:
+    return f"{GENERATION_KEY_PREFIX}:{name}"
+
+
+def get_generations(*names: str) -> dict:
+    """Return the current generation of every name in one round trip."""
+    keys = {_generation_key(name): name for name in names}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        # A generation can be evicted from Redis. Start it again from the
+        # current time so it never collides with a value used before.
+        cache.add(key, time.time_ns(), timeout=None)
+        found[key] = cache.get(key)
+    return {name: found[key] for key, name in keys.items()}
+
+
+def bump_generations(*names: str) -> None:
+    """Invalidate everything cached under the given generation names."""
+    for name in set(names):
+        key = _generation_key(name)
+        cache.add(key, time.time_ns(), timeout=None)
+        cache.incr(key)
+
+
+def _is_fresh(entry: tuple, version, beta: float) -> bool:
+    _, entry_version, delta, expires_at = entry
+    if entry_version != version:
+        return False
+    # Probabilistic early expiration: the closer the entry is to its expiry
+    # and the longer it took to compute, the more likely a request is to
+    # refresh it before it actually expires.
+    jitter = -delta * beta * math.log(1.0 - random.random())
+    return time.time() + jitter < expires_at
+
+
+def get_or_compute(
+    key: str,
+    compute,
+    timeout: int,
+    version=None,
+    stale_timeout: int = None,
+    beta: float = 1.0,
+    lock_timeout: int = 10,
+):
+    """
+    Return the cached value of ``key``, computing it with ``compute`` when
+    it is missing or stale, and let only one worker compute it at a time.
+
+    An entry is stale when it is older than ``timeout`` or was stored with
+    another ``version`` (e.g. the generations it depends on). While one
+    worker holds the short Redis lock and recomputes, the others keep
+    serving the stale value for up to ``stale_timeout`` more seconds.
+    If ``compute`` returns None or raises, nothing is cached and, for
+    ``lock_timeout`` seconds, workers compute the value themselves instead
+    of waiting for one. ``compute`` reads from the primary, so a replica
+    lagging behind an invalidation can't get stale rows cached under the
+    new version.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    uncached_key = f"{UNCACHED_KEY_PREFIX}:{key}"
+    found = cache.get_many([key, uncached_key])
+    entry = found.get(key)
+    if entry is not None and _is_fresh(entry, version, beta):
+        return entry[0]
+
+    lock = get_redis().lock(
+        f"{LOCK_KEY_PREFIX}:{key}", timeout=lock_timeout, blocking=False
+    )
+    if entry is None and found.get(uncached_key):
+        # The last computation cached nothing (e.g. a 404), so there is no
+        # value to wait for.
+        pass
+    elif not lock.acquire():
+        if entry is not None:
+            return entry[0]
+        # Nothing to serve yet: wait for the worker holding the lock, or
+        # compute the value once it gave up the lock without caching one.
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            found = cache.get_many([key, uncached_key])
+            if key in found:
+                return found[key][0]
+            if found.get(uncached_key) or lock.acquire():
+                break
+        else:
+            logger.warning("Gave up waiting for %s to be recomputed", key)
+
+    value = None
+    try:
+        started_at = time.time()
+        with read_from_primary():
+            value = compute()
+        if value is not None:
+            delta = time.time() - started_at
+            cache.set(
+                key,
+                (value, version, delta, time.time() + timeout),
+                timeout + stale_timeout,
+            )
+        return value
+    finally:
+        if value is None:
+            # `compute` returned None or raised, let the workers waiting
+            # for the value compute it themselves.
+            cache.set(uncached_key, True, lock_timeout)
+        if lock.owned():
+            lock.release()
+
+
+class MissingObjectCache:
+    """
+    Short-TTL cache of primary keys that are known not to exist.
+
+    Every entry is stamped with the "epoch" of the model read *before* the
+    database lookup, and the epoch is bumped after every commit that creates
+    a row. So a row created while an id was being looked up makes that
+    entry obsolete immediately, and a real row is never reported missing.
+    """
+
+    def __init__(self, name: str, timeout: int = 60) -> None:
+        self.name = name
+        self.timeout = timeout
+
+    @property
+    def _epoch_name(self) -> str:
+        return f"missing:{self.name}"
+
+    def _entry_key(self, pk) -> str:
+        return f"missing:{self.name}:{pk}"
+
+    @contextmanager
+    def guard(self, pk, remember: bool = True):
+        """
+        Raise Http404 right away for a primary key known to be missing, and
+        remember it if the wrapped lookup raises Http404.
+
+        Pass ``remember=False`` when the lookup is narrowed by more than the
+        primary key, so a 404 doesn't prove the row is missing.
+        """
+        epoch_key = _generation_key(self._epoch_name)
+        entry_key = self._entry_key(pk)
+        found = cache.get_many([epoch_key, entry_key])
+        epoch = found.get(epoch_key)
+        if epoch is None:
+            epoch = get_generations(self._epoch_name)[self._epoch_name]
+        elif found.get(entry_key) == epoch:
+            raise Http404
+        try:
+            yield
+        except Http404:
+            # A replica may not have received a row created meanwhile.
+            if remember and not reading_from_replica():
+                cache.set(entry_key, epoch, self.timeout)
+            raise
+
+    def invalidate(self) -> None:
+        """Forget every missing key once the current transaction commits."""
+        transaction.on_commit(lambda: bump_generations(self._epoch_name))
+
+
+class InvalidationListener:
+    """
+    Background thread that receives invalidations published by other
+    processes and hands them to the handler registered for their namespace.
+
+    The thread is started lazily, once per process, so it survives the
+    pre-fork model of gunicorn and Celery workers.
+    """
+
+    stats_flush_interval = 10
+
+    def __init__(self) -> None:
+        self._handlers = {}
+        self._stats_sources = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def register(self, namespace: str, handler, stats_source=None) -> None:
+        self._handlers[namespace] = handler
+        if stats_source is not None:
+            self._stats_sources.append(stats_source)
+
+    def publish(self, namespace: str, keys: list) -> None:
+        message = json.dumps({"namespace": namespace, "keys": keys})
+        get_redis().publish(INVALIDATION_CHANNEL, message)
+
+    def ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(
+                target=self._run, name="cache-invalidation", daemon=True
+            ).start()
+
+    def _dispatch(self, data: bytes) -> None:
+        message = json.loads(data)
+        handler = self._handlers.get(message["namespace"])
+        if handler is not None:
+            handler(message["keys"])
+
+    def _reset_all(self) -> None:
+        # Messages published while we were disconnected are lost, so
+        # nothing in the local tier can be trusted anymore.
+        for handler in self._handlers.values():
+            handler(None)
+
+    def _flush_stats(self) -> None:
+        pipeline = get_redis().pipeline(transaction=False)
+        for source in self._stats_sources:
+            for counter, value in source.pop_stats().items():
+                pipeline.hincrby(
+                    f"{STATS_KEY_PREFIX}:{source.name}", counter, value
+                )
+        pipeline.execute()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._reset_all()
+                flushed_at = time.monotonic()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._dispatch(message["data"])
+                    if (
+                        time.monotonic() - flushed_at
+                        > self.stats_flush_interval
+                    ):
+                        self._flush_stats()
+                        flushed_at = time.monotonic()
+            except redis.RedisError:
+                logger.warning(
+                    "Cache invalidation channel unavailable, retrying",
+                    exc_info=True,
+                )
+                time.sleep(1)
+            except Exception:
+                logger.exception("Failed to process a cache invalidation")
+
+
+invalidation_listener = InvalidationListener()
+
+
+class TwoTierCache:
+    """
+    Cache of small, very hot values kept in a bounded per-process LRU in
+    front of Redis.
+
+    Values returned from the local tier are shared between threads, so only
+    immutable values (strings, numbers, tuples, frozensets) should be stored.
+    Local entries also expire after ``local_timeout`` seconds, which bounds
+    staleness if an invalidation message is ever missed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 1024,
+        timeout: int = 300,
+        local_timeout: int = 30,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        invalidation_listener.register(name, self._drop_local, self)
+
+    def _redis_key(self, key) -> str:
+        return f"{self.name}:{key}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                del self._local[key]
+                entry = None
+            if entry is None:
+                self._stats["local_misses"] += 1
+                return _MISSING
+            self._stats["local_hits"] += 1
+            self._local.move_to_end(key)
+            return entry[0]
+
+    def _set_local(self, key, value) -> None:
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + self.local_timeout)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def _drop_local(self, keys) -> None:
+        with self._lock:
+            if keys is None:
+                self._local.clear()
+                return
+            for key in keys:
+                self._local.pop(key, None)
+
+    def get(self, key, default=None):
+        invalidation_listener.ensure_started()
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+
+        value = cache.get(self._redis_key(key), _MISSING)
+        if value is _MISSING:
+            self._count("redis_misses")
+            return default
+        self._count("redis_hits")
+        self._set_local(key, value)
+        return value
+
+    def set(self, key, value, timeout: int = None) -> None:
+        cache.set(self._redis_key(key), value, timeout or self.timeout)
+        self._set_local(key, value)
+
+    def get_or_set(self, key, default_func, timeout: int = None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            with read_from_primary():
+                value = default_func()
+            self.set(key, value, timeout)
+        return value
+
+    def delete(self, *keys) -> None:
+        """Drop keys from Redis and from the local tier of every process."""
+        cache.delete_many([self._redis_key(key) for key in keys])
+        self._drop_local(keys)
+        invalidation_listener.publish(self.name, list(keys))
+
+    def pop_stats(self) -> dict:
+        with self._lock:
+            stats, self._stats = self._stats, Counter()
+        return stats
+
+    def stats(self) -> dict:
+        """Hit/miss counters of both tiers, aggregated over all processes."""
+        shared = get_redis().hgetall(f"{STATS_KEY_PREFIX}:{self.name}")
+        totals = Counter(
+            {counter.decode(): int(value) for counter, value in shared.items()}
+        )
+        with self._lock:
+            totals.update(self._stats)
+        return dict(totals)
@@ -0,0 +1,95 @@
+"""
+Routing of reads to read replicas.
+
+Reads go to a replica only inside a context that allows it: safe HTTP
+methods (see `ReplicaRoutingMiddleware`) and code wrapped in
+`read_from_replica()`. The latter is meant for read-only Celery tasks,
+but none of the current tasks is one: each writes what it reads or needs
+the latest rows. Everything else, and every write, uses the primary.
+
+A user who has just written is pinned to the primary for
+REPLICA_PIN_SECONDS, so they read their own writes despite replica lag.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+PIN_KEY_PREFIX = "replica-pin"
+PIN_COOKIE = "primary_pin"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def replica_aliases() -> list[str]:
+    return settings.DATABASE_REPLICAS
+
+
+def reading_from_replica() -> bool:
+    return _use_replica.get()
+
+
+@contextmanager
+def read_from_replica(enabled: bool = True):
+    """
+    Send the reads of the wrapped block to a replica, e.g. in read-only
+    Celery tasks, when `enabled` and replicas are configured.
+    """
+    token = _use_replica.set(enabled and bool(replica_aliases()))
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Send the reads of the wrapped block to the primary."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def route_reads_to_primary() -> None:
+    """Send the remaining reads of the current request to the primary."""
+    _use_replica.set(False)
+
+
+def writes_on_safe_request(request) -> None:
+    """
+    Use the primary for the rest of a GET request that writes, and pin its
+    client to the primary afterwards like after any other write.
+    """
+    route_reads_to_primary()
+    getattr(request, "_request", request).pins_primary = True
+
+
+def pin_to_primary(user_id) -> None:
+    cache.set(
+        f"{PIN_KEY_PREFIX}:{user_id}", 1, settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    return cache.get(f"{PIN_KEY_PREFIX}:{user_id}") is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> str:
+        if _use_replica.get():
+            return random.choice(replica_aliases())
+        return "default"
+
+    def db_for_write(self, model, **hints) -> str:
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        return db == "default"
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from social_media_api.db_router import (
+    PIN_COOKIE,
+    pin_to_primary,
+    read_from_replica,
+    replica_aliases,
+)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Read from replicas while serving safe requests, except for clients
+    pinned to the primary after a write.
+
+    Clients are pinned by a short-lived cookie and, for authenticated
+    users, by a cache entry checked by `CachedJWTAuthentication`, as API
+    clients don't necessarily keep cookies.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not replica_aliases():
+            return self.get_response(request)
+
+        with read_from_replica(
+            request.method in ("GET", "HEAD")
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            response = self.get_response(request)
+
+        wrote = request.method not in SAFE_METHODS or getattr(
+            request, "pins_primary", False
+        )
+        if wrote and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+            # DRF hands the user it authenticated down to this request.
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+        return response
@@ -0,0 +1,138 @@
+"""
+Pagination whose totals don't cost a full ``COUNT(*)`` on large tables.
+
+Counting the rows of a filtered queryset reads as many rows as listing
+them all, so on PostgreSQL the planner's row estimate is returned instead
+once it is above ``PAGINATION_COUNT_ESTIMATE_THRESHOLD``. The estimate
+comes from ``EXPLAIN``, which for an unfiltered table is derived from
+``pg_class.reltuples``. Smaller totals are still counted exactly.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_CACHE_PREFIX = "pagination-count"
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """
+    Return the planner's estimate of the number of rows of `queryset`, or
+    None on databases other than PostgreSQL.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination returning an estimated total above
+    ``PAGINATION_COUNT_ESTIMATE_THRESHOLD`` rows, with ``approximate`` set
+    in the response.
+
+    Views list in `cached_count_filters` the query parameters their totals
+    can be cached for, e.g. per hashtag or per author. Totals of requests
+    filtered by those only are cached for
+    ``PAGINATION_COUNT_CACHE_TIMEOUT`` seconds, keyed by their SQL.
+    """
+
+    approximate = False
+    has_next = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count, self.approximate = self.get_total(queryset, request, view)
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        # The total may be below the actual number of rows, being estimated
+        # or cached, so the page is read even past it, with one more row
+        # telling whether there's a next page.
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        self.page = rows[:self.limit]
+        return self.page
+
+    def get_total(self, queryset: QuerySet, request, view) -> tuple:
+        """Return the total of the queryset and whether it's estimated."""
+        if not self.is_total_cached(request, view):
+            return self.count_rows(queryset)
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0, False
+        digest = hashlib.sha1(f"{sql}{params!r}".encode()).hexdigest()
+        return tuple(
+            cache.get_or_set(
+                f"{COUNT_CACHE_PREFIX}:{digest}",
+                lambda: self.count_rows(queryset),
+                timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+            )
+        )
+
+    def is_total_cached(self, request, view) -> bool:
+        filters = getattr(view, "cached_count_filters", None)
+        if filters is None:
+            return False
+        params = set(request.query_params) - {
+            self.limit_query_param,
+            self.offset_query_param,
+        }
+        return params <= set(filters)
+
+    def count_rows(self, queryset: QuerySet) -> tuple:
+        threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+        if threshold:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= threshold:
+                return estimate, True
+        return self.get_count(queryset), False
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "approximate": self.approximate,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["approximate"] = {
+            "type": "boolean",
+            "description": "Whether `count` is an estimate.",
+        }
+        return response_schema
@@ -0,0 +1,86 @@
+"""
+Per-action budgets of SQL queries.
+
+Every request served by a view using `QueryBudgetMixin` records the number
+of queries it ran and the time spent in them, on all database aliases.
+Views declare the most queries an action may run in `query_budgets`, and a
+request going over budget is logged, or fails when `QUERY_BUDGET_STRICT` is
+set, so a query per row added by a serializer or a membership test doesn't
+reach production silently.
+"""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started_at
+
+    def record(self) -> ExitStack:
+        """Install the recorder on every database connection."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+class QueryBudgetMixin:
+    """
+    Record the queries run by each request and check them against the
+    budget of the action in `query_budgets`.
+
+    Actions missing from `query_budgets` are recorded but never checked.
+    """
+
+    query_budgets = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(recorder)
+        return response
+
+    def get_query_budget(self) -> int | None:
+        return self.query_budgets.get(getattr(self, "action", None))
+
+    def check_query_budget(self, recorder: QueryRecorder) -> None:
+        action = getattr(self, "action", None)
+        logger.debug(
+            "%s.%s ran %d queries in %.1f ms",
+            type(self).__name__,
+            action,
+            recorder.count,
+            recorder.duration * 1000,
+        )
+        budget = self.get_query_budget()
+        if budget is None or recorder.count <= budget:
+            return
+        message = (
+            f"{type(self).__name__}.{action} ran {recorder.count} queries "
+            f"in {recorder.duration * 1000:.1f} ms, its budget is {budget}"
+        )
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
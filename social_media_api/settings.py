@@ -48,6 +48,10 @@ INSTALLED_APPS = [
     "rest_framework",
     "users",
     "post",
+    "media",
+    "outbox",
+    "notifications",
+    "purge",
     "drf_spectacular"
 ]
 
@@ -58,6 +62,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "social_media_api.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -93,9 +98,93 @@ DATABASES = {
             "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
             "HOST": os.environ.get("POSTGRES_HOST"),
             "PORT": os.environ.get("POSTGRES_PORT"),
+            # Seconds a connection is kept open between requests and tasks,
+            # checked before reuse when health checks are on.
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": (
+                os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "true").lower()
+                == "true"
+            ),
+            "OPTIONS": {},
         }
     }
 
+# Take connections from a psycopg_pool pool in every process instead of
+# keeping one persistent connection per thread.
+if os.environ.get("DATABASE_POOL", "false").lower() == "true":
+    DATABASES["default"].update(
+        {
+            "ENGINE": "social_media_api.backends.postgresql_pool",
+            "CONN_MAX_AGE": 0,
+        }
+    )
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+    }
+
+# Connect through PgBouncer in transaction pooling mode: server-side
+# cursors and prepared statements don't survive between transactions.
+if os.environ.get("DATABASE_PGBOUNCER", "false").lower() == "true":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+    DATABASES["default"]["OPTIONS"]["prepare_threshold"] = None
+
+# Read replicas of the primary, as comma-separated hosts. Safe requests
+# and read-only tasks read from them, see social_media_api.db_router.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")),
+    start=1,
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["social_media_api.db_router.ReplicaRouter"]
+
+# Seconds a client reads from the primary after writing, so it sees its
+# own writes despite replication lag.
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379/1")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "social_media_api",
+    }
+}
+
+# How long (in seconds) anonymous responses of the posts API stay cached.
+POST_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("POST_RESPONSE_CACHE_TIMEOUT", 60)
+)
+
+# How long (in seconds) the subscriptions feed of a user stays cached.
+FEED_CACHE_TIMEOUT = int(os.environ.get("FEED_CACHE_TIMEOUT", 60))
+
+# How long (in seconds) the rendered profile of a user stays cached.
+PROFILE_CACHE_TIMEOUT = int(os.environ.get("PROFILE_CACHE_TIMEOUT", 300))
+
+# How long (in seconds) users resolved from access tokens stay cached.
+AUTHENTICATED_USER_CACHE_TIMEOUT = int(
+    os.environ.get("AUTHENTICATED_USER_CACHE_TIMEOUT", 60)
+)
+
+# How long (in seconds) an expired or invalidated value may still be served
+# while a single worker recomputes it.
+CACHE_STALE_TIMEOUT = int(os.environ.get("CACHE_STALE_TIMEOUT", 30))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -133,6 +222,51 @@ STATIC_URL = "static/"
 MEDIA_URL = "/mediafiles/"
 MEDIA_ROOT = BASE_DIR / "mediafiles"
 
+# Uploads are stored under the hash of their content, see
+# media.storage.ContentAddressedStorage.
+STORAGES = {
+    "default": {
+        "BACKEND": "media.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# How media files are sent once media.views.MediaView allowed them:
+# "x-accel-redirect" hands the transfer to nginx through an internal
+# location mapped to MEDIA_ROOT, "x-sendfile" to Apache/lighttpd, and an
+# empty value streams the file from Django.
+MEDIA_SENDFILE_BACKEND = os.environ.get("MEDIA_SENDFILE_BACKEND", "")
+MEDIA_ACCEL_REDIRECT_LOCATION = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_LOCATION", "/protected-media/"
+)
+
+# Maximum size (in bytes) of uploaded images per form field. Larger
+# uploads are rejected while they are still being received.
+IMAGE_UPLOAD_LIMITS = {
+    "image": 2097152,
+    "photo": 2097152,
+}
+
+FILE_UPLOAD_HANDLERS = [
+    "media.upload_handlers.ImageUploadLimitHandler",
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Limits of images fetched from remote URLs (bytes and seconds).
+REMOTE_IMAGE_MAX_BYTES = int(os.environ.get("REMOTE_IMAGE_MAX_BYTES", 2097152))
+REMOTE_IMAGE_CONNECT_TIMEOUT = float(
+    os.environ.get("REMOTE_IMAGE_CONNECT_TIMEOUT", 3)
+)
+REMOTE_IMAGE_READ_TIMEOUT = float(
+    os.environ.get("REMOTE_IMAGE_READ_TIMEOUT", 5)
+)
+REMOTE_IMAGE_TOTAL_TIMEOUT = float(
+    os.environ.get("REMOTE_IMAGE_TOTAL_TIMEOUT", 15)
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -144,25 +278,62 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
+    "TOKEN_REFRESH_SERIALIZER": (
+        "users.serializers.RevocableTokenRefreshSerializer"
+    ),
 }
 
+# How often (in seconds) every worker rebuilds its in-memory filter of
+# revoked tokens from Redis.
+TOKEN_REVOCATION_REFRESH_INTERVAL = int(
+    os.environ.get("TOKEN_REVOCATION_REFRESH_INTERVAL", 60)
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "social_media_api.throttling.AnonRedisRateThrottle",
+        "social_media_api.throttling.UserRedisRateThrottle",
+        "social_media_api.throttling.ActionRedisRateThrottle",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "media.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": (
+        "social_media_api.pagination.EstimatedCountPagination"
+    ),
     "PAGE_SIZE": 50,
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/minute", "user": "30/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/minute",
+        "user": "30/minute",
+        "interactions": "10/minute",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Above how many rows (by the planner's estimate) list totals are estimated
+# instead of counted, 0 to always count, and how long (in seconds) totals
+# of common filters are cached.
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get("PAGINATION_COUNT_ESTIMATE_THRESHOLD", 10000)
+)
+PAGINATION_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("PAGINATION_COUNT_CACHE_TIMEOUT", 60)
+)
+
+# Fail requests running more queries than the budget of their view action
+# instead of logging a warning.
+QUERY_BUDGET_STRICT = (
+    os.environ.get("QUERY_BUDGET_STRICT", "false").lower() == "true"
+)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Social Media API",
     "DESCRIPTION": "API for Social Media App",
@@ -187,3 +358,130 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "Europe/Kiev"
 CELERY_TASK_TRACK_STARTED = True
+
+# Tasks run on separate queues, each served by its own workers (see
+# docker-compose.yml), so slow image processing can't hold back
+# publishing scheduled posts.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_ROUTES = {
+    "post.tasks.*": {"queue": "scheduling"},
+    "outbox.tasks.*": {"queue": "scheduling"},
+    "notifications.tasks.*": {"queue": "notifications"},
+    "media.tasks.*": {"queue": "media"},
+}
+
+# Workers reserve one task per process at a time and acknowledge it once
+# it's done, so tasks of a worker that dies are redelivered instead of
+# lost. Tasks must be idempotent for that.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(
+    os.environ.get("CELERY_WORKER_PREFETCH_MULTIPLIER", 1)
+)
+CELERY_TASK_ACKS_LATE = (
+    os.environ.get("CELERY_TASK_ACKS_LATE", "true").lower() == "true"
+)
+CELERY_TASK_REJECT_ON_WORKER_LOST = CELERY_TASK_ACKS_LATE
+
+# Time limits (in seconds) of every task, media tasks get their own.
+CELERY_TASK_SOFT_TIME_LIMIT = int(
+    os.environ.get("CELERY_TASK_SOFT_TIME_LIMIT", 60)
+)
+CELERY_TASK_TIME_LIMIT = int(os.environ.get("CELERY_TASK_TIME_LIMIT", 90))
+MEDIA_TASK_SOFT_TIME_LIMIT = int(
+    os.environ.get("MEDIA_TASK_SOFT_TIME_LIMIT", 120)
+)
+MEDIA_TASK_TIME_LIMIT = int(os.environ.get("MEDIA_TASK_TIME_LIMIT", 180))
+# Constraint validation scans a whole table.
+MAINTENANCE_TASK_SOFT_TIME_LIMIT = int(
+    os.environ.get("MAINTENANCE_TASK_SOFT_TIME_LIMIT", 3600)
+)
+MAINTENANCE_TASK_TIME_LIMIT = int(
+    os.environ.get("MAINTENANCE_TASK_TIME_LIMIT", 3900)
+)
+
+# Nothing reads the results of these tasks, so they aren't stored.
+CELERY_TASK_ANNOTATIONS = {
+    "post.tasks.create_scheduled_post": {"ignore_result": True},
+    "post.tasks.publish_due_posts": {"ignore_result": True},
+    "outbox.tasks.relay_outbox": {"ignore_result": True},
+    "notifications.tasks.start_post_fanouts": {"ignore_result": True},
+    "notifications.tasks.fan_out_post": {"ignore_result": True},
+    "purge.tasks.purge_batch": {"ignore_result": True},
+    "purge.tasks.resume_purge_jobs": {"ignore_result": True},
+    "media.tasks.fetch_remote_image": {
+        "ignore_result": True,
+        "soft_time_limit": MEDIA_TASK_SOFT_TIME_LIMIT,
+        "time_limit": MEDIA_TASK_TIME_LIMIT,
+    },
+    "media.tasks.generate_image_variants": {
+        "ignore_result": True,
+        "soft_time_limit": MEDIA_TASK_SOFT_TIME_LIMIT,
+        "time_limit": MEDIA_TASK_TIME_LIMIT,
+    },
+    "users.tasks.validate_age_constraint": {
+        "ignore_result": True,
+        "soft_time_limit": MAINTENANCE_TASK_SOFT_TIME_LIMIT,
+        "time_limit": MAINTENANCE_TASK_TIME_LIMIT,
+    },
+}
+
+# How often (in seconds) due scheduled posts are published, and how many
+# are published per transaction.
+SCHEDULED_POSTS_PUBLISH_INTERVAL = float(
+    os.environ.get("SCHEDULED_POSTS_PUBLISH_INTERVAL", 30)
+)
+SCHEDULED_POSTS_BATCH_SIZE = int(
+    os.environ.get("SCHEDULED_POSTS_BATCH_SIZE", 500)
+)
+
+# Months of post partitions created ahead of time once `post_post` is
+# partitioned (see `python manage.py partition_posts`).
+POST_PARTITION_MONTHS_AHEAD = int(
+    os.environ.get("POST_PARTITION_MONTHS_AHEAD", 3)
+)
+
+# How many days back the post feeds go, 0 for no limit. A limit lets
+# PostgreSQL skip the partitions of older months.
+POST_FEED_WINDOW_DAYS = int(os.environ.get("POST_FEED_WINDOW_DAYS", 0))
+
+# How often (in seconds) committed outbox events are relayed to their
+# consumers, and how many are relayed per transaction. Events are also
+# added to OUTBOX_REDIS_STREAM when it's set.
+OUTBOX_RELAY_INTERVAL = float(os.environ.get("OUTBOX_RELAY_INTERVAL", 5))
+OUTBOX_RELAY_BATCH_SIZE = int(os.environ.get("OUTBOX_RELAY_BATCH_SIZE", 500))
+OUTBOX_REDIS_STREAM = os.environ.get("OUTBOX_REDIS_STREAM", "")
+OUTBOX_REDIS_STREAM_MAXLEN = int(
+    os.environ.get("OUTBOX_REDIS_STREAM_MAXLEN", 100000)
+)
+
+# How many followers are notified about a new post per transaction.
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(
+    os.environ.get("NOTIFICATION_FANOUT_CHUNK_SIZE", 1000)
+)
+
+# How many rows of a deleted user or post are deleted per transaction, and
+# after how many seconds without progress a purge job is queued again.
+PURGE_BATCH_SIZE = int(os.environ.get("PURGE_BATCH_SIZE", 500))
+PURGE_RESUME_AFTER = int(os.environ.get("PURGE_RESUME_AFTER", 15 * 60))
+
+CELERY_BEAT_SCHEDULE = {
+    "publish-due-posts": {
+        "task": "post.tasks.publish_due_posts",
+        "schedule": SCHEDULED_POSTS_PUBLISH_INTERVAL,
+    },
+    "relay-outbox": {
+        "task": "outbox.tasks.relay_outbox",
+        "schedule": OUTBOX_RELAY_INTERVAL,
+    },
+    "create-post-partitions": {
+        "task": "post.tasks.create_post_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+    "validate-age-constraint": {
+        "task": "users.tasks.validate_age_constraint",
+        "schedule": 24 * 60 * 60,
+    },
+    "resume-purge-jobs": {
+        "task": "purge.tasks.resume_purge_jobs",
+        "schedule": PURGE_RESUME_AFTER,
+    },
+}
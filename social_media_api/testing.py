@@ -0,0 +1,120 @@
+"""
+Helpers for the tests of the API views.
+"""
+from itertools import count
+from typing import Callable
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from post.models import Comment, Hashtag, Post
+from social_media_api.cache import invalidation_listener
+from social_media_api.query_budget import QueryRecorder
+from users.models import User
+
+sequence = count()
+
+
+def create_user(**fields) -> User:
+    number = next(sequence)
+    return User.objects.create_user(
+        email=f"user{number}@example.com",
+        password="password123",
+        first_name=f"First{number}",
+        last_name=f"Last{number}",
+        **fields,
+    )
+
+
+def create_posts(owner: User, number: int = 3) -> list:
+    """Create posts with hashtags, comments and likes by new users."""
+    posts = []
+    for _ in range(number):
+        index = next(sequence)
+        post = Post.objects.create(
+            title=f"Post {index}", text="Text", owner=owner
+        )
+        for tag in (f"tag{index}", "common"):
+            post.hashtags.add(Hashtag.objects.get_or_create(tag=tag)[0])
+        for _ in range(2):
+            user = create_user()
+            post.comments.add(
+                Comment.objects.create(text="Comment", owner=user)
+            )
+            post.likes.add(user)
+        posts.append(post)
+    return posts
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class QueryBudgetTestCase(APITestCase):
+    """
+    Check the actions of `view_class` against its `query_budgets`.
+
+    Queries are counted with every cache cold, so a budget holds for the
+    worst case, and counted again after more data is seeded, so an action
+    running a query per row fails even when it is within budget.
+    """
+
+    view_class = None
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Throttling doesn't query the database, but would fail requests.
+        patcher = mock.patch.object(self.view_class, "throttle_classes", ())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def authenticate(self, user) -> None:
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+
+    @staticmethod
+    def count_queries(request: Callable[[], Response]) -> tuple:
+        cache.clear()
+        invalidation_listener._reset_all()
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = request()
+        return response, recorder.count
+
+    def assertQueryBudget(
+        self,
+        action: str,
+        request: Callable[[], Response],
+        seed: Callable[[], None],
+    ) -> None:
+        """
+        Call `request` before and after `seed` adds more data, both calls
+        must succeed within the budget of `action` and run as many queries.
+        """
+        budget = self.view_class.query_budgets[action]
+        counts = []
+        for grow in (None, seed):
+            if grow is not None:
+                grow()
+            response, count = self.count_queries(request)
+            self.assertLess(response.status_code, 400, response.content)
+            self.assertLessEqual(
+                count,
+                budget,
+                f"{action} ran {count} queries, its budget is {budget}",
+            )
+            counts.append(count)
+        self.assertEqual(
+            counts[0],
+            counts[1],
+            f"{action} runs more queries as data grows",
+        )
@@ -0,0 +1,64 @@
+from unittest import mock
+
+import redis
+from django.test import SimpleTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from social_media_api import throttling
+from social_media_api.cache import get_redis
+from social_media_api.testing import sequence
+from social_media_api.throttling import AnonRedisRateThrottle
+
+
+class TwoPerMinuteThrottle(AnonRedisRateThrottle):
+    rate = "2/minute"
+
+
+def anon_request() -> Request:
+    number = next(sequence)
+    address = f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}"
+    return Request(APIRequestFactory().get("/", REMOTE_ADDR=address))
+
+
+class RedisRateThrottleTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.request = anon_request()
+        self.addCleanup(self.clear_bucket, self.request)
+
+    def clear_bucket(self, request: Request) -> None:
+        key = TwoPerMinuteThrottle().get_cache_key(request, None)
+        get_redis().delete(f"{throttling.THROTTLE_KEY_PREFIX}:{key}")
+
+    def allow(self) -> tuple:
+        throttle = TwoPerMinuteThrottle()
+        return throttle.allow_request(self.request, None), throttle.wait()
+
+    def test_requests_are_denied_once_the_bucket_is_empty(self) -> None:
+        self.assertEqual(self.allow(), (True, None))
+        self.assertEqual(self.allow(), (True, None))
+
+        allowed, wait = self.allow()
+
+        self.assertFalse(allowed)
+        # One token is refilled every 30 seconds.
+        self.assertGreater(wait, 25)
+        self.assertLessEqual(wait, 30)
+
+    def test_buckets_are_per_client(self) -> None:
+        for _ in range(3):
+            self.allow()
+        other = anon_request()
+        self.addCleanup(self.clear_bucket, other)
+
+        self.assertTrue(TwoPerMinuteThrottle().allow_request(other, None))
+
+    def test_requests_are_allowed_while_redis_is_unavailable(self) -> None:
+        script = mock.Mock(side_effect=redis.ConnectionError)
+        with mock.patch.object(
+            throttling, "_token_bucket", return_value=script
+        ), self.assertLogs(throttling.logger, "WARNING"):
+            for _ in range(3):
+                self.assertEqual(self.allow(), (True, None))
+
+        self.assertEqual(script.call_count, 3)
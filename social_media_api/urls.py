@@ -15,9 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.auth.views import LogoutView
 from django.urls import path
 from debug_toolbar.toolbar import debug_toolbar_urls
 from django.urls.conf import include
@@ -31,6 +29,8 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from users.views import TokenLogoutView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path(
@@ -46,15 +46,22 @@ urlpatterns = [
     path(
         "api/v1/token/verify/", TokenVerifyView.as_view(), name="token_verify"
     ),
-    path("api/v1/token/logout/", LogoutView.as_view(), name="token_logout"),
+    path(
+        "api/v1/token/logout/",
+        TokenLogoutView.as_view(),
+        name="token_logout",
+    ),
+    path(
+        "api/v1/users/me/notifications/",
+        include("notifications.urls"),
+    ),
     path("api/v1/users/", include("users.urls")),
     path("api/v1/posts/", include("post.urls")),
+    path(settings.MEDIA_URL.lstrip("/"), include("media.urls")),
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/v1/doc/swagger/",
         SpectacularSwaggerView.as_view(url_name="schema"),
         name="swagger-ui"
     )
-] + debug_toolbar_urls() + static(
-    settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-)
+] + debug_toolbar_urls()
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from social_media_api.cache import (
+    TwoTierCache,
+    bump_generations,
+    get_generations,
+)
+from social_media_api.db_router import (
+    is_pinned_to_primary,
+    read_from_primary,
+    replica_aliases,
+    route_reads_to_primary,
+)
+from users.models import User
+from users.revocation import revocation_list
+
+authenticated_users = TwoTierCache(
+    "authenticated-user",
+    maxsize=4096,
+    timeout=settings.AUTHENTICATED_USER_CACHE_TIMEOUT,
+    local_timeout=min(settings.AUTHENTICATED_USER_CACHE_TIMEOUT, 10),
+)
+
+
+def authenticated_user_generation(user_id: int) -> str:
+    return f"authenticated-user:{user_id}"
+
+
+def drop_cached_user(user_id: int) -> None:
+    """
+    Drop the cached user. Its generation is bumped first, so a request
+    which read the old row and caches it afterwards drops it again.
+    """
+    bump_generations(authenticated_user_generation(user_id))
+    authenticated_users.delete(user_id)
+
+
+_USER_FIELDS = [field.attname for field in User._meta.concrete_fields]
+
+
+def _dump_user(user: User) -> tuple:
+    return tuple(getattr(user, field) for field in _USER_FIELDS)
+
+
+def _load_user(values: tuple) -> User:
+    # Every request gets its own instance, so views can't mutate a user
+    # shared through the local cache tier.
+    return User.from_db(router.db_for_read(User), _USER_FIELDS, values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user from a short-lived two-tier
+    cache, so most authenticated requests don't query `users_user`.
+
+    Cached users are dropped by `users.signals` whenever the row is saved
+    (profile changes, password changes, deactivation) or deleted.
+
+    Tokens revoked on logout are rejected. Users who have just written
+    read from the primary for the rest of the request.
+    """
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        validated_token = super().get_validated_token(raw_token)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti is not None and revocation_list.is_revoked(jti):
+            raise InvalidToken(_("Token is revoked"))
+        return validated_token
+
+    def get_user(self, validated_token: Token) -> User:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is not None
+            and replica_aliases()
+            and is_pinned_to_primary(user_id)
+        ):
+            route_reads_to_primary()
+        if user_id is None or api_settings.USER_ID_FIELD != "id":
+            return super().get_user(validated_token)
+
+        values = authenticated_users.get(user_id)
+        if values is None:
+            name = authenticated_user_generation(user_id)
+            generation = get_generations(name)[name]
+            # Loaded from the primary, a lagging replica could still hold
+            # the password or active flag the cache was invalidated for.
+            with read_from_primary():
+                user = super().get_user(validated_token)
+            authenticated_users.set(user_id, _dump_user(user))
+            # A change committed while the row was read invalidated the
+            # cache before this copy was stored, so drop it again.
+            if get_generations(name)[name] != generation:
+                authenticated_users.delete(user_id)
+            return user
+
+        user = _load_user(values)
+        self.check_user(user, validated_token)
+        return user
+
+    @staticmethod
+    def check_user(user: User, validated_token: Token) -> None:
+        """Run the checks `JWTAuthentication` does on a freshly loaded user."""
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed",
+            )
@@ -0,0 +1,50 @@
+"""
+Two-tier caches of small values that are read on almost every request, the
+negative cache of user ids that don't exist and the generations of per-user
+cached data.
+
+Entries are invalidated by the signal handlers in ``users.signals``.
+"""
+from social_media_api.cache import MissingObjectCache, TwoTierCache
+from users.models import ResidencePlace, User
+
+FEED_CACHE_PREFIX = "users:feed"
+PROFILE_CACHE_PREFIX = "users:profile"
+
+residence_places = TwoTierCache("residence-place")
+user_display_names = TwoTierCache("user-display-name")
+missing_users = MissingObjectCache("user")
+
+
+def residence_place_label(residence_place_id: int | None) -> str | None:
+    if residence_place_id is None:
+        return None
+    return residence_places.get_or_set(
+        residence_place_id,
+        lambda: str(ResidencePlace.objects.get(pk=residence_place_id)),
+    )
+
+
+def user_display_name(user_id: int, user: User | None = None) -> str:
+    """
+    Return the display name of a user. A user already loaded by the caller
+    is rendered as is, without a cache lookup per row.
+    """
+    if user is not None:
+        return str(user)
+    return user_display_names.get_or_set(
+        user_id,
+        lambda: str(
+            User.objects.only(
+                "first_name", "last_name", "username", "email"
+            ).get(pk=user_id)
+        ),
+    )
+
+
+def subscriptions_generation(user_id: int) -> str:
+    return f"subscriptions:{user_id}"
+
+
+def profile_generation(user_id: int) -> str:
+    return f"profile:{user_id}"
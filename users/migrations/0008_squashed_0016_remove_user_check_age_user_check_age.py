@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Replaces the migrations that dropped and re-added `check_age` with the
+    bounds of the day they were generated. The constraint they created is
+    replaced by `check_min_age` in 0019, so fresh databases skip it.
+    """
+
+    replaces = [
+        ("users", "0008_user_check_age"),
+        ("users", "0009_remove_user_check_age_user_check_age"),
+        ("users", "0010_remove_user_check_age_user_check_age"),
+        ("users", "0011_remove_user_check_age_user_check_age"),
+        ("users", "0012_remove_user_check_age_user_check_age"),
+        ("users", "0013_remove_user_check_age_user_check_age"),
+        ("users", "0014_remove_user_check_age_user_check_age"),
+        ("users", "0015_remove_user_check_age_user_check_age"),
+        ("users", "0016_remove_user_check_age_user_check_age"),
+    ]
+
+    dependencies = [
+        ("users", "0007_user_unique_username"),
+    ]
+
+    operations = []
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0016_remove_user_check_age_user_check_age"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="photo_source_url",
+            field=models.URLField(
+                blank=True,
+                db_comment="Remote URL the photo of the user is fetched from.",
+                max_length=2000,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="photo_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                db_comment="State of fetching the photo from its remote URL.",
+                default="",
+                max_length=10,
+            ),
+        ),
+    ]
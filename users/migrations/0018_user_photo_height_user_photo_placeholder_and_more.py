@@ -0,0 +1,54 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0017_user_photo_source_url_user_photo_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="photo_height",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_comment="Height of the photo in pixels.",
+                editable=False,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="photo_placeholder",
+            field=models.CharField(
+                blank=True,
+                db_comment="A few pixels of the photo shown while it loads.",
+                default="",
+                editable=False,
+                max_length=100,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="photo_variants",
+            field=models.JSONField(
+                blank=True,
+                db_comment="Resized variants of the photo.",
+                default=dict,
+                editable=False,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="photo_width",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_comment="Width of the photo in pixels.",
+                editable=False,
+                null=True,
+            ),
+        ),
+    ]
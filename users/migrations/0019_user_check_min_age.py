@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+import users.models
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the `check_age` constraint, whose bounds were fixed when its
+    migration was generated, with a minimum age check against the current
+    date. The constraint is added NOT VALID so existing rows aren't scanned
+    under lock, `users.tasks.validate_age_constraint` validates them later.
+    The maximum age is only checked by `validate_birth_date`, since rows
+    would stop meeting it as time goes by.
+    """
+
+    dependencies = [
+        ("users", "0018_user_photo_height_user_photo_placeholder_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "ALTER TABLE users_user DROP CONSTRAINT IF EXISTS check_age",
+                "ALTER TABLE users_user ADD CONSTRAINT check_min_age "
+                "CHECK (birth_date IS NULL "
+                "OR birth_date <= CURRENT_DATE - INTERVAL '13 years') "
+                "NOT VALID",
+            ],
+            reverse_sql=(
+                "ALTER TABLE users_user DROP CONSTRAINT IF EXISTS "
+                "check_min_age"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="birth_date",
+            field=models.DateField(
+                blank=True,
+                db_comment="Date of birth of the user.",
+                help_text="Date of birth of the user.",
+                null=True,
+                validators=[users.models.validate_birth_date],
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0019_user_check_min_age"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_comment="When the user was deleted, their rows are purged in the background.",
+                editable=False,
+                null=True,
+            ),
+        ),
+    ]
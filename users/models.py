@@ -2,21 +2,29 @@ from __future__ import annotations
 
 import os.path
 import uuid
-from datetime import timedelta, date
+from datetime import date
 
 import pycountry
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from media.models import RemoteImageStatus
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
 
     use_in_migrations = True
 
+    def get_queryset(self) -> models.QuerySet:
+        """Hide soft-deleted users, see `User.all_objects`."""
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
     def _create_user(
         self,
         email: str,
@@ -95,6 +103,37 @@ class ResidencePlace(models.Model):
         ]
 
 
+def years_before(day: date, years: int) -> date:
+    """
+    Return the same day `years` years earlier, February 29 becoming
+    February 28, as PostgreSQL computes `date - INTERVAL 'N years'`.
+    """
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def validate_birth_date(value: date) -> None:
+    """
+    Users must be at least 13 and less than 100 years old.
+
+    The database only checks the minimum age (`check_min_age`), a bound
+    relative to the current date which every row keeps meeting over time.
+    Ages are counted in calendar years from the current date in UTC, the
+    time zone of the database connections, like the constraint does.
+    """
+    today = timezone.now().date()
+    if not (years_before(today, 100) <= value <= years_before(today, 13)):
+        raise ValidationError(
+            _(
+                "User must be at least 13 years old and less than 100 "
+                "years old."
+            ),
+            code="check_age",
+        )
+
+
 def create_custom_path_for_photo(instance: User, filename: str) -> str:
     _, extension = os.path.splitext(filename)
     return f"users-photos/{instance.email}/photos/{uuid.uuid4()}{extension}"
@@ -119,10 +158,12 @@ class User(AbstractUser):
 
     # Use the custom UserManager.
     objects = UserManager()
+    all_objects = models.Manager()
 
     birth_date = models.DateField(
         null=True,
         blank=True,
+        validators=[validate_birth_date],
         db_comment="Date of birth of the user.",
         help_text="Date of birth of the user.",
     )
@@ -135,6 +176,50 @@ class User(AbstractUser):
         help_text="Photo of the user.",
     )
 
+    photo_source_url = models.URLField(
+        max_length=2000,
+        null=True,
+        blank=True,
+        db_comment="Remote URL the photo of the user is fetched from.",
+    )
+
+    photo_status = models.CharField(
+        max_length=10,
+        choices=RemoteImageStatus.choices,
+        blank=True,
+        default="",
+        db_comment="State of fetching the photo from its remote URL.",
+    )
+
+    photo_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="Width of the photo in pixels.",
+    )
+
+    photo_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="Height of the photo in pixels.",
+    )
+
+    photo_placeholder = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        editable=False,
+        db_comment="A few pixels of the photo shown while it loads.",
+    )
+
+    photo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        db_comment="Resized variants of the photo.",
+    )
+
     residence_place = models.ForeignKey(
         ResidencePlace,
         on_delete=models.SET_NULL,
@@ -144,6 +229,14 @@ class User(AbstractUser):
         help_text="Residence place of the user.",
     )
 
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="When the user was deleted, their rows are purged in "
+                   "the background.",
+    )
+
     followers = models.ManyToManyField(
         "User",
         symmetrical=False,
@@ -165,6 +258,8 @@ class User(AbstractUser):
         return self.email
 
     def clean(self):
+        if self.birth_date is not None:
+            validate_birth_date(self.birth_date)
         if self.photo:
             max_image_size = 2097152
             if self.photo.size > max_image_size:
@@ -192,14 +287,6 @@ class User(AbstractUser):
                 violation_error_message="A user with that username already "
                 "exists.",
             ),
-            models.CheckConstraint(
-                check=Q(birth_date__isnull=True)
-                | Q(birth_date__lte=date.today() - timedelta(days=365 * 13))
-                & Q(birth_date__gte=date.today() - timedelta(days=365 * 100)),
-                name="check_age",
-                violation_error_message="User must be at least 13 years old "
-                "and less than 100 years old.",
-            ),
         ]
 
     def __str__(self):
@@ -0,0 +1,166 @@
+"""
+Revocation list of JWT access and refresh tokens.
+
+Revoked JTIs are stored in Redis with a TTL equal to the remaining lifetime
+of the token, and indexed in a sorted set scored by expiry. Every worker
+keeps a Bloom filter of that set in memory, so the common "not revoked"
+answer needs no network hop. New revocations reach the filters of all
+workers through the pub/sub channel of the two-tier caches, and filters are
+rebuilt from Redis periodically and after a lost connection.
+
+While Redis is unavailable, checks are answered from the last filter: a
+token in the filter is taken as revoked, as it can't be confirmed.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+from social_media_api.cache import get_redis, invalidation_listener
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "social_media_api:revoked-jti"
+REVOKED_INDEX_KEY = "social_media_api:revoked-jti-index"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenRevocationList:
+    namespace = "revoked-jti"
+
+    def __init__(self, refresh_interval: int, min_capacity: int = 10000):
+        self.refresh_interval = refresh_interval
+        self.min_capacity = min_capacity
+        self._bloom = BloomFilter(min_capacity)
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        # Revocations received while the filter is rebuilt, added to the
+        # new filter before it replaces the current one.
+        self._pending = None
+        self._bloom_lock = threading.Lock()
+        invalidation_listener.register(self.namespace, self._on_message)
+
+    def _key(self, jti: str) -> str:
+        return f"{REVOKED_KEY_PREFIX}:{jti}"
+
+    def _on_message(self, jtis: list | None) -> None:
+        if jtis is None:
+            # Revocations may have been missed, rebuild on next check.
+            self._refreshed_at = 0.0
+            return
+        for jti in jtis:
+            self._add(jti)
+
+    def _add(self, jti: str) -> None:
+        with self._bloom_lock:
+            self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def _refresh(self) -> None:
+        # Revocations published before this point are already in the index.
+        with self._bloom_lock:
+            self._pending = []
+        try:
+            client = get_redis()
+            now = time.time()
+            client.zremrangebyscore(REVOKED_INDEX_KEY, "-inf", now)
+            jtis = client.zrange(REVOKED_INDEX_KEY, 0, -1)
+            bloom = BloomFilter(max(self.min_capacity, len(jtis) * 2))
+            for jti in jtis:
+                bloom.add(jti.decode())
+            with self._bloom_lock:
+                for jti in self._pending:
+                    bloom.add(jti)
+                self._bloom = bloom
+        finally:
+            with self._bloom_lock:
+                self._pending = None
+        self._refreshed_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        invalidation_listener.ensure_started()
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return
+            try:
+                self._refresh()
+            except redis.RedisError:
+                logger.warning(
+                    "Revoked tokens unavailable, using the last filter",
+                    exc_info=True,
+                )
+                # Retried after the interval rather than on every check.
+                self._refreshed_at = time.monotonic()
+
+    def revoke(self, jti: str, expires_at: int) -> bool:
+        """
+        Revoke a token until its `exp` timestamp.
+
+        Return False when the token was already revoked (or has expired),
+        the check and the revocation being a single atomic ``SET NX``.
+        """
+        ttl = math.ceil(expires_at - time.time())
+        if ttl <= 0:
+            return False
+        pipeline = get_redis().pipeline()
+        pipeline.set(self._key(jti), 1, ex=ttl, nx=True)
+        pipeline.zadd(REVOKED_INDEX_KEY, {jti: expires_at})
+        revoked, _ = pipeline.execute()
+        if not revoked:
+            return False
+        self._add(jti)
+        invalidation_listener.publish(self.namespace, [jti])
+        return True
+
+    def is_revoked(self, jti: str) -> bool:
+        self._ensure_fresh()
+        if jti not in self._bloom:
+            return False
+        try:
+            return bool(get_redis().exists(self._key(jti)))
+        except redis.RedisError:
+            logger.warning(
+                "Revoked tokens unavailable, using the last filter",
+                exc_info=True,
+            )
+            return True
+
+
+revocation_list = TokenRevocationList(
+    refresh_interval=settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+)
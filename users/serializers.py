@@ -1,16 +1,71 @@
 import os
-from urllib.request import urlopen
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from django.core.files.base import ContentFile
+from django.db.models import QuerySet
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from media.serializers import ImageVariantsField, RemoteImageSerializerMixin
+from purge.serializers import SoftDeletedUniqueMixin
+from users.cache import residence_place_label, user_display_name
 from users.models import User, ResidencePlace
+from users.revocation import revocation_list
+
+# How many followers and subscriptions are embedded in a profile.
+PROFILE_PREVIEW_SIZE = 10
+
+# Fields loaded for the users embedded in a profile.
+PREVIEW_USER_FIELDS = ("id", "username", "first_name", "last_name", "email")
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class ResidencePlaceLabelField(serializers.ReadOnlyField):
+    """Render a residence place by its id from the two-tier cache."""
+
+    def to_representation(self, value: int | None) -> str | None:
+        return residence_place_label(value)
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class UserDisplayNameField(serializers.ReadOnlyField):
+    """
+    Render the user of a foreign key, from the user loaded with
+    `select_related` when there is one, or by their id from the two-tier
+    cache, so a list doesn't run a query or a cache lookup per row.
+    """
 
+    def __init__(self, user_field: str, **kwargs) -> None:
+        self.user_field = user_field
+        kwargs.setdefault("source", "*")
+        super().__init__(**kwargs)
 
-class UserCreateSerializer(serializers.ModelSerializer):
-    """User model serializer."""
+    def to_representation(self, instance) -> str:
+        field = instance._meta.get_field(self.user_field)
+        user = None
+        if field.is_cached(instance):
+            user = getattr(instance, self.user_field)
+        return user_display_name(getattr(instance, field.attname), user)
+
+
+class UserCreateSerializer(
+    SoftDeletedUniqueMixin,
+    RemoteImageSerializerMixin,
+    serializers.ModelSerializer,
+):
+    """
+    User model serializer.
+
+    A photo can be given as a URL, it is then fetched in the background.
+    """
+
+    remote_image_field = "photo"
 
     residence_place = serializers.PrimaryKeyRelatedField(
         queryset=ResidencePlace.objects.all(),
@@ -32,8 +87,10 @@ class UserCreateSerializer(serializers.ModelSerializer):
             "last_name",
             "birth_date",
             "photo",
+            "photo_status",
             "residence_place",
         ]
+        read_only_fields = ["photo_status"]
         extra_kwargs = {
             "password": {
                 "write_only": True,
@@ -77,26 +134,13 @@ class UserCreateSerializer(serializers.ModelSerializer):
             data["birth_date"] = None
         if "photo" in data and data["photo"] == "":
             data["photo"] = None
-        if (
-            "photo" in data
-            and isinstance(data["photo"], str)
-            and data["photo"].startswith("http")
-        ):
-            try:
-                response = urlopen(data["photo"])
-                file_name = os.path.basename(data["photo"])
-                data["photo"] = ContentFile(response.read(), name=file_name)
-            except Exception:
-                raise serializers.ValidationError(
-                    {"photo": "Error downloading image."}
-                )
         return super().to_internal_value(data)
 
     def create(self, validated_data: dict) -> User:
         return get_user_model().objects.create_user(**validated_data)
 
     def update(self, instance: User, validated_data: dict) -> User:
-        if validated_data["photo"]:
+        if validated_data.get("photo"):
             if instance.photo:
                 old_name_photo = os.path.basename(instance.photo.name)
                 new_name_photo = validated_data["photo"].name
@@ -108,9 +152,10 @@ class UserCreateSerializer(serializers.ModelSerializer):
 class UserListSerializer(serializers.ModelSerializer):
     """User model list serializer."""
 
-    residence_place = serializers.StringRelatedField()
+    residence_place = ResidencePlaceLabelField(source="residence_place_id")
     is_following = serializers.BooleanField()
     subscribed = serializers.BooleanField()
+    photo_variants = ImageVariantsField("photo")
 
     class Meta:
         model = User
@@ -122,6 +167,7 @@ class UserListSerializer(serializers.ModelSerializer):
             "last_name",
             "birth_date",
             "residence_place",
+            "photo_variants",
             "is_following",
             "subscribed",
         ]
@@ -149,11 +195,20 @@ class UserDetailFollowersAndSubscriptionsSerializer(
 
 
 class UserManageSerializer(serializers.ModelSerializer):
-    """User model serializer for managing a user profile."""
+    """
+    User model serializer for managing a user profile.
 
-    residence_place = serializers.StringRelatedField()
-    followers = UserDetailFollowersAndSubscriptionsSerializer(many=True)
+    Followers and subscriptions are embedded as counts plus a bounded
+    preview, the full lists are served by the paginated
+    `me/followers/` and `me/subscriptions/` endpoints.
+    """
+
+    residence_place = ResidencePlaceLabelField(source="residence_place_id")
+    followers_count = serializers.SerializerMethodField()
+    subscriptions_count = serializers.SerializerMethodField()
+    followers = serializers.SerializerMethodField()
     subscriptions = serializers.SerializerMethodField()
+    photo_variants = ImageVariantsField("photo")
 
     class Meta:
         model = User
@@ -167,15 +222,39 @@ class UserManageSerializer(serializers.ModelSerializer):
             "birth_date",
             "residence_place",
             "photo",
+            "photo_status",
+            "photo_variants",
+            "followers_count",
             "followers",
+            "subscriptions_count",
             "subscriptions",
         ]
 
-    def get_subscriptions(self, obj):
+    @staticmethod
+    def _preview(queryset: QuerySet) -> list:
         return UserDetailFollowersAndSubscriptionsSerializer(
-            obj.my_subscriptions, many=True
+            queryset.only(*PREVIEW_USER_FIELDS)[:PROFILE_PREVIEW_SIZE],
+            many=True,
         ).data
 
+    def get_followers_count(self, obj: User) -> int:
+        return obj.followers.count()
+
+    def get_subscriptions_count(self, obj: User) -> int:
+        return obj.my_subscriptions.count()
+
+    @extend_schema_field(
+        UserDetailFollowersAndSubscriptionsSerializer(many=True)
+    )
+    def get_followers(self, obj: User) -> list:
+        return self._preview(obj.followers.all())
+
+    @extend_schema_field(
+        UserDetailFollowersAndSubscriptionsSerializer(many=True)
+    )
+    def get_subscriptions(self, obj: User) -> list:
+        return self._preview(obj.my_subscriptions.all())
+
 
 class UserDetailSerializer(UserManageSerializer):
     """
@@ -226,3 +305,42 @@ class UserPasswordUpdateSerializer(serializers.ModelSerializer):
         instance.set_password(validated_data["password"])
         instance.save()
         return instance
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that rejects revoked refresh tokens and revokes
+    the refresh token it has just rotated.
+
+    The rotated token is revoked atomically, so of two concurrent refreshes
+    of the same token only one gets new tokens.
+    """
+
+    def validate(self, attrs: dict) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        if revocation_list.is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is revoked"))
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and not revocation_list.revoke(
+            refresh[api_settings.JTI_CLAIM], refresh["exp"]
+        ):
+            raise TokenError(_("Token is revoked"))
+        return data
+
+
+class TokenLogoutSerializer(serializers.Serializer):
+    """Serializer for revoking a refresh token on logout."""
+
+    refresh = serializers.CharField(write_only=True)
+
+    def validate_refresh(self, value: str) -> RefreshToken:
+        try:
+            return RefreshToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(error.args[0])
+
+    def save(self, **kwargs) -> None:
+        refresh = self.validated_data["refresh"]
+        revocation_list.revoke(
+            refresh[api_settings.JTI_CLAIM], refresh["exp"]
+        )
@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from media.signals import (
+    dispatch_image_variants,
+    find_replaced_image,
+    release_image_files,
+    release_replaced_image,
+    remember_image_name,
+)
+from social_media_api.cache import bump_generations
+from users.authentication import drop_cached_user
+from users.cache import (
+    missing_users,
+    profile_generation,
+    residence_places,
+    subscriptions_generation,
+    user_display_names,
+)
+from users.models import ResidencePlace, User
+
+
+@receiver(post_save, sender=User)
+def invalidate_missing_users(sender, instance: User, **kwargs) -> None:
+    if kwargs.get("created"):
+        missing_users.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance: User, **kwargs) -> None:
+    if kwargs.get("created"):
+        return
+    transaction.on_commit(lambda: drop_cached_user(instance.pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_display_name(sender, instance: User, **kwargs) -> None:
+    if kwargs.get("created"):
+        return
+    transaction.on_commit(lambda: user_display_names.delete(instance.pk))
+
+
+@receiver(post_save, sender=ResidencePlace)
+@receiver(post_delete, sender=ResidencePlace)
+def invalidate_residence_place(
+    sender, instance: ResidencePlace, **kwargs
+) -> None:
+    if kwargs.get("created"):
+        return
+    transaction.on_commit(lambda: residence_places.delete(instance.pk))
+
+
+@receiver(m2m_changed, sender=User.my_subscriptions.through)
+def invalidate_subscriptions(
+    sender, instance: User, action: str, reverse: bool, pk_set: set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        subscriber_ids = [instance.pk]
+    elif pk_set:
+        subscriber_ids = pk_set
+    else:
+        subscriber_ids = instance.my_subscribers.values_list("id", flat=True)
+    names = [subscriptions_generation(pk) for pk in subscriber_ids]
+    transaction.on_commit(lambda: bump_generations(*names))
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile(sender, instance: User, **kwargs) -> None:
+    name = profile_generation(instance.pk)
+    transaction.on_commit(lambda: bump_generations(name))
+
+
+@receiver(post_save, sender=User)
+def create_photo_variants(sender, instance: User, **kwargs) -> None:
+    dispatch_image_variants(instance, "photo")
+
+
+@receiver(post_init, sender=User)
+def remember_photo(sender, instance: User, **kwargs) -> None:
+    remember_image_name(instance, "photo")
+
+
+@receiver(pre_save, sender=User)
+def find_replaced_photo(sender, instance: User, **kwargs) -> None:
+    find_replaced_image(instance, "photo", kwargs.get("update_fields"))
+
+
+@receiver(post_save, sender=User)
+def release_replaced_photo(sender, instance: User, **kwargs) -> None:
+    release_replaced_image(instance, "photo")
+
+
+@receiver(post_delete, sender=User)
+def release_photo(sender, instance: User, **kwargs) -> None:
+    release_image_files(instance, "photo")
+
+
+@receiver(m2m_changed, sender=User.followers.through)
+@receiver(m2m_changed, sender=User.my_subscriptions.through)
+def invalidate_follow_profiles(
+    sender, instance: User, action: str, pk_set: set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    user_ids = {instance.pk, *(pk_set or ())}
+    if action == "pre_clear":
+        for edge in sender.objects.filter(
+            Q(from_user=instance) | Q(to_user=instance)
+        ).values_list("from_user_id", "to_user_id"):
+            user_ids.update(edge)
+    names = [profile_generation(pk) for pk in user_ids]
+    transaction.on_commit(lambda: bump_generations(*names))
@@ -0,0 +1,37 @@
+import logging
+
+from celery import shared_task
+from django.db import connection
+
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+AGE_CONSTRAINT = "check_min_age"
+
+
+@shared_task
+def validate_age_constraint() -> bool:
+    """
+    Validate the `check_min_age` constraint, added NOT VALID by its
+    migration, against the existing users.
+
+    VALIDATE CONSTRAINT only takes a SHARE UPDATE EXCLUSIVE lock, so users
+    can still be read and written while the table is scanned. Once the
+    constraint is valid the task does nothing.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT convalidated FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND conname = %s",
+            [User._meta.db_table, AGE_CONSTRAINT],
+        )
+        row = cursor.fetchone()
+        if row is None or row[0]:
+            return False
+        cursor.execute(
+            f"ALTER TABLE {User._meta.db_table} "
+            f"VALIDATE CONSTRAINT {AGE_CONSTRAINT}"
+        )
+    logger.info("Validated the %s constraint", AGE_CONSTRAINT)
+    return True
@@ -1,3 +1,244 @@
-from django.test import TestCase
+import time
+import uuid
+from datetime import date, datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+import redis
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.response import Response
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from social_media_api.testing import (
+    QueryBudgetTestCase,
+    create_posts,
+    create_user,
+    sequence,
+)
+from users.models import ResidencePlace, User, validate_birth_date
+from users.revocation import revocation_list
+from users.views import UserViewSet
+
+
+def user_url(user: User, name: str = "user-detail") -> str:
+    return reverse(f"users:{name}", args=[user.id])
+
+
+class UserViewSetQueryBudgetTests(QueryBudgetTestCase):
+    view_class = UserViewSet
+
+    def setUp(self) -> None:
+        super().setUp()
+        residence_place = ResidencePlace.objects.create(
+            country="Ukraine", code_country="UA"
+        )
+        self.user = create_user(residence_place=residence_place)
+        self.admin = create_user(is_staff=True)
+        self.others = [
+            create_user(residence_place=residence_place) for _ in range(3)
+        ]
+        for other in self.others[:2]:
+            self.user.my_subscriptions.add(other)
+            other.followers.add(self.user)
+            self.user.followers.add(other)
+            other.my_subscriptions.add(self.user)
+            for post in create_posts(other, 2):
+                post.likes.add(self.user)
+        create_posts(self.user, 2)
+        self.authenticate(self.user)
+
+    def seed(self) -> None:
+        for _ in range(3):
+            other = create_user()
+            self.user.my_subscriptions.add(other)
+            other.followers.add(self.user)
+            self.user.followers.add(other)
+            other.my_subscriptions.add(self.user)
+            for post in create_posts(other, 2):
+                post.likes.add(self.user)
+        create_posts(self.user, 2)
+
+    def test_list(self) -> None:
+        self.assertQueryBudget(
+            "list",
+            lambda: self.client.get(
+                reverse("users:user-list"), {"first_name": "First"}
+            ),
+            self.seed,
+        )
+
+    def test_retrieve(self) -> None:
+        other = self.others[0]
+
+        def seed() -> None:
+            self.seed()
+            for _ in range(3):
+                user = create_user()
+                other.followers.add(user)
+                other.my_subscriptions.add(user)
+
+        self.assertQueryBudget(
+            "retrieve", lambda: self.client.get(user_url(other)), seed
+        )
+
+    def test_create(self) -> None:
+        self.client.credentials()
+
+        def request() -> Response:
+            return self.client.post(
+                reverse("users:user-list"),
+                {
+                    "email": f"new{next(sequence)}@example.com",
+                    "password": "Secret-password-1",
+                },
+                format="json",
+            )
+
+        self.assertQueryBudget("create", request, self.seed)
+
+    def test_update(self) -> None:
+        self.authenticate(self.admin)
+        for action, method in (
+            ("update", self.client.put),
+            ("partial_update", self.client.patch),
+        ):
+
+            def request() -> Response:
+                return method(
+                    user_url(self.others[2]),
+                    {
+                        "email": f"updated{next(sequence)}@example.com",
+                        "first_name": "Updated",
+                    },
+                    format="json",
+                )
+
+            self.assertQueryBudget(action, request, self.seed)
+
+    def test_destroy(self) -> None:
+        self.authenticate(self.admin)
+        users = iter(self.others[:2])
+        self.assertQueryBudget(
+            "destroy",
+            lambda: self.client.delete(user_url(next(users))),
+            self.seed,
+        )
+
+    def test_subscribe_and_unsubscribe(self) -> None:
+        others = [create_user() for _ in range(2)]
+        for action in ("subscribe", "unsubscribe"):
+            users = iter(others)
+            self.assertQueryBudget(
+                action,
+                lambda: self.client.get(
+                    user_url(next(users), f"user-{action}")
+                ),
+                self.seed,
+            )
+
+    def test_posts(self) -> None:
+        for action, name in (
+            ("my_posts", "user-my-posts"),
+            ("my_subscriptions_posts", "user-my-subscriptions-posts"),
+            ("liked_posts", "user-liked-posts"),
+        ):
+            self.assertQueryBudget(
+                action,
+                lambda: self.client.get(reverse(f"users:{name}")),
+                self.seed,
+            )
+
+
+class UserSoftDeleteTests(QueryBudgetTestCase):
+    view_class = UserViewSet
+
+    def test_email_and_username_of_deleted_user_stay_taken(self) -> None:
+        cache.clear()
+        user = create_user(username="same")
+        self.authenticate(create_user(is_staff=True))
+        self.assertEqual(self.client.delete(user_url(user)).status_code, 204)
+        self.client.credentials()
+
+        response = self.client.post(
+            reverse("users:user-list"),
+            {
+                "email": user.email,
+                "username": "same",
+                "password": "Secret-password-1",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data)
+        self.assertIn("username", response.data)
+
+
+class TokenRevocationTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.jti = uuid.uuid4().hex
+        self.expires_at = int(time.time()) + 60
+
+    def test_revoke_once(self) -> None:
+        self.assertTrue(revocation_list.revoke(self.jti, self.expires_at))
+        self.assertFalse(revocation_list.revoke(self.jti, self.expires_at))
+        self.assertTrue(revocation_list.is_revoked(self.jti))
+
+    def test_last_filter_is_used_while_redis_is_down(self) -> None:
+        revocation_list.revoke(self.jti, self.expires_at)
+        client = mock.Mock()
+        client.exists.side_effect = redis.ConnectionError
+        client.zremrangebyscore.side_effect = redis.ConnectionError
+        with mock.patch(
+            "users.revocation.get_redis", return_value=client
+        ), self.assertLogs("users.revocation", "WARNING"):
+            revocation_list._refreshed_at = 0.0
+            self.assertTrue(revocation_list.is_revoked(self.jti))
+            self.assertFalse(revocation_list.is_revoked(uuid.uuid4().hex))
+        self.assertTrue(client.zremrangebyscore.called)
+
+
+class TokenRefreshTests(APITestCase):
+    def test_rotated_token_is_refreshed_once(self) -> None:
+        refresh = str(RefreshToken.for_user(create_user()))
+        url = reverse("token_refresh")
+        # Both requests get past the check, as concurrent ones would.
+        with mock.patch.object(
+            revocation_list, "is_revoked", return_value=False
+        ):
+            first = self.client.post(url, {"refresh": refresh})
+            second = self.client.post(url, {"refresh": refresh})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 401)
+
+
+class BirthDateValidationTests(SimpleTestCase):
+    """The age bounds match `check_min_age`, counted in calendar years."""
+
+    def assertBounds(self, today: date, oldest: date, youngest: date):
+        now = datetime(
+            today.year, today.month, today.day, 12, tzinfo=timezone.utc
+        )
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            validate_birth_date(oldest)
+            validate_birth_date(youngest)
+            for birth_date in (
+                date.fromordinal(oldest.toordinal() - 1),
+                date.fromordinal(youngest.toordinal() + 1),
+            ):
+                with self.assertRaises(ValidationError):
+                    validate_birth_date(birth_date)
+
+    def test_bounds(self) -> None:
+        self.assertBounds(
+            date(2026, 10, 19), date(1926, 10, 19), date(2013, 10, 19)
+        )
+
+    def test_bounds_on_february_29(self) -> None:
+        self.assertBounds(
+            date(2024, 2, 29), date(1924, 2, 29), date(2011, 2, 28)
+        )
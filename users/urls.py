@@ -1,7 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from users.views import UserViewSet, ManageUserView, UserPasswordUpdateView
+from users.views import (
+    UserViewSet,
+    ManageUserView,
+    ManageUserFollowersView,
+    ManageUserSubscriptionsView,
+    UserPasswordUpdateView,
+)
 
 router = DefaultRouter()
 router.register("users", UserViewSet)
@@ -9,6 +15,16 @@ router.register("users", UserViewSet)
 urlpatterns = [
     path("", include(router.urls)),
     path("me/", ManageUserView.as_view(), name="me"),
+    path(
+        "me/followers/",
+        ManageUserFollowersView.as_view(),
+        name="me-followers",
+    ),
+    path(
+        "me/subscriptions/",
+        ManageUserSubscriptionsView.as_view(),
+        name="me-subscriptions",
+    ),
     path(
         "me/update-password/",
         UserPasswordUpdateView.as_view(),
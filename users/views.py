@@ -1,5 +1,7 @@
 from typing import Type
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Exists, OuterRef, QuerySet, Count
 from django.http import HttpResponseRedirect, HttpRequest
 from drf_spectacular.utils import (
@@ -15,9 +17,23 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.serializers import Serializer
+from rest_framework_simplejwt.settings import api_settings
 
+from outbox.events import USER_FOLLOWED, USER_UNFOLLOWED, publish
+from post.cache import POST_LIST_GENERATION
 from post.models import Post
 from post.serializers import PostListSerializer
+from purge.deletion import soft_delete
+from social_media_api.cache import get_generations, get_or_compute
+from social_media_api.db_router import writes_on_safe_request
+from social_media_api.query_budget import QueryBudgetMixin
+from users.cache import (
+    FEED_CACHE_PREFIX,
+    PROFILE_CACHE_PREFIX,
+    missing_users,
+    profile_generation,
+    subscriptions_generation,
+)
 from users.models import User
 from users.serializers import (
     UserCreateSerializer,
@@ -26,7 +42,11 @@ from users.serializers import (
     UserUpdateSerializer,
     UserPasswordUpdateSerializer,
     UserManageSerializer,
+    UserDetailFollowersAndSubscriptionsSerializer,
+    TokenLogoutSerializer,
+    PREVIEW_USER_FIELDS,
 )
+from users.revocation import revocation_list
 
 
 @extend_schema_view(
@@ -104,7 +124,9 @@ from users.serializers import (
     ),
     destroy=extend_schema(
         summary="Delete a user",
-        description="Delete a user by ID.",
+        description="Delete a user by ID. The user and their posts are "
+                    "hidden at once, the rest of their data is deleted in "
+                    "the background.",
         tags=["Users"],
         responses={
             204: OpenApiResponse(description="No Content"),
@@ -152,13 +174,31 @@ from users.serializers import (
         },
     ),
 )
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to be viewed or edited.
     """
 
     queryset = User.objects.all().select_related("residence_place")
     permission_classes = (IsAuthenticated,)
+    action_throttle_scopes = {
+        "subscribe": "interactions",
+        "unsubscribe": "interactions",
+    }
+    cached_count_filters = ("residence",)
+    query_budgets = {
+        "list": 5,
+        "retrieve": 7,
+        "create": 2,
+        "update": 4,
+        "partial_update": 4,
+        "destroy": 7,
+        "subscribe": 10,
+        "unsubscribe": 8,
+        "my_posts": 3,
+        "my_subscriptions_posts": 3,
+        "liked_posts": 3,
+    }
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -212,6 +252,16 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_object(self) -> User:
+        with missing_users.guard(
+            self.kwargs[self.lookup_field],
+            remember=not self.request.query_params,
+        ):
+            return super().get_object()
+
+    def perform_destroy(self, instance: User) -> None:
+        soft_delete(instance)
+
     def retrieve(self, request, *args, **kwargs) -> HttpResponseRedirect:
         """
         Retrieve a user by their ID. If the user ID matches the current
@@ -235,8 +285,10 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def subscribe(self, request: HttpRequest, pk: int = None) -> Response:
         user = self.request.user
-        user_to_subscribe = get_object_or_404(User, pk=pk)
-        if user_to_subscribe in user.my_subscriptions.all():
+        writes_on_safe_request(request)
+        with missing_users.guard(pk):
+            user_to_subscribe = get_object_or_404(User, pk=pk)
+        if user.my_subscriptions.filter(pk=user_to_subscribe.pk).exists():
             return Response(
                 data={
                     "message": f"Already followed from {user_to_subscribe} "
@@ -244,8 +296,14 @@ class UserViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_200_OK,
             )
-        user.my_subscriptions.add(user_to_subscribe)
-        user_to_subscribe.followers.add(user)
+        with transaction.atomic():
+            user.my_subscriptions.add(user_to_subscribe)
+            user_to_subscribe.followers.add(user)
+            publish(
+                USER_FOLLOWED,
+                follower_id=user.id,
+                user_id=user_to_subscribe.id,
+            )
         return Response(
             data={"message": f"Subscribed from {user_to_subscribe} (id={pk})"},
             status=status.HTTP_200_OK,
@@ -260,8 +318,12 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def unsubscribe(self, request: HttpRequest, pk: int = None) -> Response:
         user = self.request.user
-        user_to_unsubscribe = get_object_or_404(User, pk=pk)
-        if user_to_unsubscribe not in user.my_subscriptions.all():
+        writes_on_safe_request(request)
+        with missing_users.guard(pk):
+            user_to_unsubscribe = get_object_or_404(User, pk=pk)
+        if not user.my_subscriptions.filter(
+            pk=user_to_unsubscribe.pk
+        ).exists():
             return Response(
                 data={
                     "message": f"Not followed from {user_to_unsubscribe} "
@@ -269,8 +331,14 @@ class UserViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_200_OK,
             )
-        user.my_subscriptions.remove(user_to_unsubscribe)
-        user_to_unsubscribe.followers.remove(user)
+        with transaction.atomic():
+            user.my_subscriptions.remove(user_to_unsubscribe)
+            user_to_unsubscribe.followers.remove(user)
+            publish(
+                USER_UNFOLLOWED,
+                follower_id=user.id,
+                user_id=user_to_unsubscribe.id,
+            )
         return Response(
             data={
                 "message": f"Unsubscribed from {user_to_unsubscribe} (id={pk})"
@@ -287,8 +355,13 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def my_posts(self, request: HttpRequest, pk: int = None) -> Response:
         user = self.request.user
-        posts = Post.objects.filter(owner=user).annotate(
-            comments_count=Count("comments"), likes_count=Count("likes")
+        posts = (
+            Post.objects.filter(owner=user)
+            .select_related("owner")
+            .prefetch_related("hashtags")
+            .annotate(
+                comments_count=Count("comments"), likes_count=Count("likes")
+            )
         )
         serializer = PostListSerializer(posts, many=True)
         return Response(serializer.data)
@@ -304,13 +377,31 @@ class UserViewSet(viewsets.ModelViewSet):
         self, request: HttpRequest, pk: int = None
     ) -> Response:
         user = self.request.user
-        posts = Post.objects.filter(
-            owner__in=user.my_subscriptions.all()
-        ).annotate(
-            comments_count=Count("comments"), likes_count=Count("likes")
+
+        def render() -> list:
+            posts = (
+                Post.objects.published()
+                .recent()
+                .filter(owner__in=user.my_subscriptions.all())
+                .select_related("owner")
+                .prefetch_related("hashtags")
+                .annotate(
+                    comments_count=Count("comments"),
+                    likes_count=Count("likes"),
+                )
+            )
+            return PostListSerializer(posts, many=True).data
+
+        generations = get_generations(
+            POST_LIST_GENERATION, subscriptions_generation(user.id)
         )
-        serializer = PostListSerializer(posts, many=True)
-        return Response(serializer.data)
+        data = get_or_compute(
+            f"{FEED_CACHE_PREFIX}:{user.id}",
+            render,
+            timeout=settings.FEED_CACHE_TIMEOUT,
+            version=sorted(generations.items()),
+        )
+        return Response(data)
 
     @action(
         detail=False,
@@ -321,8 +412,14 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def liked_posts(self, request: HttpRequest, pk: int = None) -> Response:
         user = self.request.user
-        posts = Post.objects.filter(likes=user).annotate(
-            comments_count=Count("comments"), likes_count=Count("likes")
+        posts = (
+            Post.objects.published()
+            .filter(likes=user)
+            .select_related("owner")
+            .prefetch_related("hashtags")
+            .annotate(
+                comments_count=Count("comments"), likes_count=Count("likes")
+            )
         )
         serializer = PostListSerializer(posts, many=True)
         return Response(serializer.data)
@@ -356,7 +453,9 @@ class UserViewSet(viewsets.ModelViewSet):
     ),
     delete=extend_schema(
         summary="Delete current user",
-        description="Delete the current authenticated user.",
+        description="Delete the current authenticated user. The user and "
+                    "their posts are hidden at once, the rest of their data "
+                    "is deleted in the background.",
         tags=["Manage profile"],
         responses={
             204: OpenApiResponse(description="No Content"),
@@ -387,6 +486,72 @@ class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
             return UserManageSerializer
         return UserUpdateSerializer
 
+    def perform_destroy(self, instance: User) -> None:
+        soft_delete(instance)
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        """
+        Serve the rendered profile from the cache. It is invalidated when
+        the user, their followers or their subscriptions change.
+        """
+        user = self.request.user
+        generations = get_generations(profile_generation(user.id))
+        data = get_or_compute(
+            f"{PROFILE_CACHE_PREFIX}:{user.id}:{request.get_host()}",
+            lambda: super(ManageUserView, self).retrieve(
+                request, *args, **kwargs
+            ).data,
+            timeout=settings.PROFILE_CACHE_TIMEOUT,
+            version=sorted(generations.items()),
+        )
+        return Response(data)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="List my followers",
+        description="Retrieve a paginated list of users following the "
+                    "current authenticated user.",
+        tags=["Manage profile"],
+        responses={
+            200: UserDetailFollowersAndSubscriptionsSerializer(many=True),
+        },
+    ),
+)
+class ManageUserFollowersView(generics.ListAPIView):
+    """
+    API endpoint that lists the followers of the current user.
+    """
+
+    serializer_class = UserDetailFollowersAndSubscriptionsSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet:
+        return self.request.user.followers.only(*PREVIEW_USER_FIELDS)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="List my subscriptions",
+        description="Retrieve a paginated list of users the current "
+                    "authenticated user is subscribed to.",
+        tags=["Manage profile"],
+        responses={
+            200: UserDetailFollowersAndSubscriptionsSerializer(many=True),
+        },
+    ),
+)
+class ManageUserSubscriptionsView(generics.ListAPIView):
+    """
+    API endpoint that lists the users the current user is subscribed to.
+    """
+
+    serializer_class = UserDetailFollowersAndSubscriptionsSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self) -> QuerySet:
+        return self.request.user.my_subscriptions.only(*PREVIEW_USER_FIELDS)
+
 
 @extend_schema_view(
     put=extend_schema(
@@ -417,3 +582,33 @@ class UserPasswordUpdateView(generics.UpdateAPIView):
 
     def get_object(self) -> User:
         return self.request.user
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="Log out",
+        description="Revoke the given refresh token and, if the request is "
+                    "authenticated, the access token it was made with.",
+        tags=["Authentication"],
+        responses={
+            205: OpenApiResponse(description="Tokens revoked"),
+        },
+    ),
+)
+class TokenLogoutView(generics.GenericAPIView):
+    """
+    API endpoint that revokes JWT tokens on logout.
+    """
+
+    serializer_class = TokenLogoutSerializer
+    permission_classes = (AllowAny,)
+
+    def post(self, request: HttpRequest) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        if request.auth is not None:
+            revocation_list.revoke(
+                request.auth[api_settings.JTI_CLAIM], request.auth["exp"]
+            )
+        return Response(status=status.HTTP_205_RESET_CONTENT)